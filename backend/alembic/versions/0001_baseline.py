@@ -0,0 +1,266 @@
+"""Baseline schema previously created by Base.metadata.create_all
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Existing databases already have these tables: mark them with
+`alembic stamp 0001` once, then run `alembic upgrade head`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+user_role = postgresql.ENUM("user", "enterprise", "owner", "admin", name="userrole", create_type=False)
+payment_method = postgresql.ENUM("vietqr", "cash", name="paymentmethod", create_type=False)
+payment_status = postgresql.ENUM(
+    "pending", "verifying", "paid", "partial", "failed", "refunded",
+    name="paymentstatus",
+    create_type=False,
+)
+booking_status = postgresql.ENUM(
+    "pending", "confirmed", "active", "completed", "cancelled",
+    name="bookingstatus",
+    create_type=False,
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for enum_type in (user_role, payment_method, payment_status, booking_status):
+        enum_type.create(bind, checkfirst=True)
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("phone_number", sa.String(), nullable=True),
+        sa.Column("avatar_url", sa.String(), nullable=True),
+        sa.Column("role", user_role, nullable=False),
+        sa.Column("address", sa.String(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("bank_account_number", sa.String(), nullable=True),
+        sa.Column("bank_account_name", sa.String(), nullable=True),
+        sa.Column("bank_name", sa.String(), nullable=True),
+        sa.Column("bank_code", sa.String(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "courts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("address", sa.String(), nullable=False),
+        sa.Column("district", sa.String(), nullable=False),
+        sa.Column("city", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("court_quantity", sa.Integer(), nullable=False),
+        sa.Column("opening_time", sa.String(), nullable=False),
+        sa.Column("closing_time", sa.String(), nullable=False),
+        sa.Column("facilities", sa.JSON(), nullable=True),
+        sa.Column("contact_phone", sa.String(), nullable=False),
+        sa.Column("contact_email", sa.String(), nullable=True),
+        sa.Column("images", sa.JSON(), nullable=True),
+        sa.Column("time_slots", sa.JSON(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_courts_id", "courts", ["id"])
+
+    op.create_table(
+        "individual_courts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("court_id", sa.Integer(), sa.ForeignKey("courts.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_individual_courts_id", "individual_courts", ["id"])
+
+    op.create_table(
+        "bookings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("individual_court_id", sa.Integer(), sa.ForeignKey("individual_courts.id"), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("booking_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("start_time", sa.String(), nullable=False),
+        sa.Column("end_time", sa.String(), nullable=False),
+        sa.Column("phone_number", sa.String(), nullable=False),
+        sa.Column("customer_name", sa.String(), nullable=True),
+        sa.Column("total_hours", sa.Numeric(4, 2), nullable=True),
+        sa.Column("total_price", sa.Numeric(10, 2), nullable=True),
+        sa.Column("customer_email", sa.String(), nullable=True),
+        sa.Column("payment_method", payment_method, nullable=False),
+        sa.Column("payment_status", payment_status, nullable=False),
+        sa.Column("booking_status", booking_status, nullable=False),
+        sa.Column("qr_code_url", sa.String(), nullable=True),
+        sa.Column("bank_transaction_id", sa.String(), nullable=True),
+        sa.Column("payment_verified_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("payment_note", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(), server_default="pending", nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_bookings_id", "bookings", ["id"])
+
+    op.create_table(
+        "booking_invites",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("booking_id", sa.Integer(), sa.ForeignKey("bookings.id"), nullable=False),
+        sa.Column("inviter_user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("invitee_user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("code", sa.String(16), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("responded_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.UniqueConstraint("code", name="uq_booking_invites_code"),
+    )
+    op.create_index("ix_booking_invites_id", "booking_invites", ["id"])
+    op.create_index("ix_booking_invites_booking_id", "booking_invites", ["booking_id"])
+    op.create_index("ix_booking_invites_inviter_user_id", "booking_invites", ["inviter_user_id"])
+    op.create_index("ix_booking_invites_invitee_user_id", "booking_invites", ["invitee_user_id"])
+    op.create_index("ix_booking_invites_code", "booking_invites", ["code"])
+
+    op.create_table(
+        "notifications",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("type", sa.String(), nullable=False),
+        sa.Column("related_id", sa.Integer(), nullable=True),
+        sa.Column("is_read", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_notifications_id", "notifications", ["id"])
+
+    op.create_table(
+        "court_requests",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("address", sa.String(), nullable=False),
+        sa.Column("district", sa.String(), nullable=False),
+        sa.Column("city", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("court_quantity", sa.Integer(), nullable=False),
+        sa.Column("opening_time", sa.String(), nullable=False),
+        sa.Column("closing_time", sa.String(), nullable=False),
+        sa.Column("facilities", sa.String(), nullable=True),
+        sa.Column("contact_phone", sa.String(), nullable=False),
+        sa.Column("contact_email", sa.String(), nullable=True),
+        sa.Column("images", sa.String(), nullable=True),
+        sa.Column("time_slots", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("rejection_reason", sa.Text(), nullable=True),
+        sa.Column("reviewed_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("reviewed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_court_requests_id", "court_requests", ["id"])
+
+    op.create_table(
+        "advertisement_requests",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("enterprise_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("detail_url", sa.String(), nullable=False),
+        sa.Column("image_url", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("rejection_reason", sa.Text(), nullable=True),
+        sa.Column("reviewed_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("reviewed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_advertisement_requests_id", "advertisement_requests", ["id"])
+
+    op.create_table(
+        "advertisement_clicks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "advertisement_request_id",
+            sa.Integer(),
+            sa.ForeignKey("advertisement_requests.id"),
+            nullable=False,
+        ),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("ip_address", sa.String(), nullable=True),
+        sa.Column("user_agent", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_advertisement_clicks_id", "advertisement_clicks", ["id"])
+    op.create_index(
+        "ix_advertisement_clicks_advertisement_request_id",
+        "advertisement_clicks",
+        ["advertisement_request_id"],
+    )
+
+    op.create_table(
+        "friend_requests",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sender_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("receiver_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("responded_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_friend_requests_id", "friend_requests", ["id"])
+    op.create_index("ix_friend_requests_sender_id", "friend_requests", ["sender_id"])
+    op.create_index("ix_friend_requests_receiver_id", "friend_requests", ["receiver_id"])
+
+    op.create_table(
+        "friendships",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_low_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("user_high_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("current_streak", sa.Integer(), nullable=False),
+        sa.Column("best_streak", sa.Integer(), nullable=False),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.UniqueConstraint("user_low_id", "user_high_id", name="uq_friendships_pair"),
+    )
+    op.create_index("ix_friendships_id", "friendships", ["id"])
+    op.create_index("ix_friendships_user_low_id", "friendships", ["user_low_id"])
+    op.create_index("ix_friendships_user_high_id", "friendships", ["user_high_id"])
+
+
+def downgrade() -> None:
+    for table in (
+        "friendships",
+        "friend_requests",
+        "advertisement_clicks",
+        "advertisement_requests",
+        "court_requests",
+        "notifications",
+        "booking_invites",
+        "bookings",
+        "individual_courts",
+        "courts",
+        "users",
+    ):
+        op.drop_table(table)
+
+    bind = op.get_bind()
+    for enum_type in (booking_status, payment_status, payment_method, user_role):
+        enum_type.drop(bind, checkfirst=True)
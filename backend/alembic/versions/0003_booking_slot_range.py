@@ -0,0 +1,56 @@
+"""Add bookings.slot_range and the no-overlap exclusion constraint
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+Fails if existing bookings already overlap; cancel or move them and rerun.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute("ALTER TABLE bookings ADD COLUMN IF NOT EXISTS slot_range TSTZRANGE")
+
+    # Same local-time range that create_booking stores for new rows.
+    op.execute(
+        """
+        UPDATE bookings
+        SET slot_range = tstzrange(
+            (date(booking_date) + start_time::time) AT TIME ZONE 'Asia/Ho_Chi_Minh',
+            (date(booking_date) + end_time::time) AT TIME ZONE 'Asia/Ho_Chi_Minh',
+            '[)'
+        )
+        WHERE slot_range IS NULL
+        """
+    )
+
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'ex_bookings_no_overlap') THEN
+                ALTER TABLE bookings
+                ADD CONSTRAINT ex_bookings_no_overlap
+                EXCLUDE USING gist (individual_court_id WITH =, slot_range WITH &&)
+                WHERE (status IN ('pending', 'active', 'confirmed'));
+            END IF;
+        END
+        $$
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_no_overlap")
+    op.execute("ALTER TABLE bookings DROP COLUMN IF EXISTS slot_range")
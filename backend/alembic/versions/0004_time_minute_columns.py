@@ -0,0 +1,43 @@
+"""Add minute-of-day columns for booking and venue times
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# "HH:MM" -> minutes since midnight, NULL for malformed values.
+_MINUTES_SQL = (
+    "CASE WHEN {column} ~ '^[0-9]{{1,2}}:[0-9]{{2}}$' "
+    "THEN split_part({column}, ':', 1)::int * 60 + split_part({column}, ':', 2)::int END"
+)
+
+_MINUTE_COLUMNS = {
+    "bookings": {"start_minute": "start_time", "end_minute": "end_time"},
+    "courts": {"opening_minute": "opening_time", "closing_minute": "closing_time"},
+}
+
+
+def upgrade() -> None:
+    for table, columns in _MINUTE_COLUMNS.items():
+        for minute_column, source_column in columns.items():
+            op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {minute_column} INTEGER")
+            op.execute(
+                f"UPDATE {table} SET {minute_column} = {_MINUTES_SQL.format(column=source_column)} "
+                f"WHERE {minute_column} IS NULL"
+            )
+
+
+def downgrade() -> None:
+    for table, columns in _MINUTE_COLUMNS.items():
+        for minute_column in columns:
+            op.execute(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {minute_column}")
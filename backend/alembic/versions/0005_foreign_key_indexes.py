@@ -0,0 +1,40 @@
+"""Index foreign keys used by owner, user and notification lookups
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column)
+_INDEXES = (
+    ("ix_courts_owner_id", "courts", "owner_id"),
+    ("ix_individual_courts_court_id", "individual_courts", "court_id"),
+    ("ix_bookings_user_id", "bookings", "user_id"),
+    ("ix_notifications_user_id", "notifications", "user_id"),
+    ("ix_court_requests_owner_id", "court_requests", "owner_id"),
+    ("ix_advertisement_requests_enterprise_id", "advertisement_requests", "enterprise_id"),
+    ("ix_advertisement_clicks_user_id", "advertisement_clicks", "user_id"),
+)
+
+
+def upgrade() -> None:
+    # Built concurrently so live tables are not locked against writes.
+    with op.get_context().autocommit_block():
+        for name, table, column in _INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column})")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _column in _INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,38 @@
+"""Composite indexes for the keyset-paginated notification feed
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so live tables are not locked against writes.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notifications_user_id_created_at_id "
+            "ON notifications (user_id, created_at DESC, id DESC)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notifications_user_id_type_created_at_id "
+            "ON notifications (user_id, type, created_at DESC, id DESC)"
+        )
+        # Every lookup by user_id is now served by a composite index with user_id first.
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notifications_user_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_notifications_user_id ON notifications (user_id)")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notifications_user_id_type_created_at_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_notifications_user_id_created_at_id")
@@ -0,0 +1,41 @@
+"""Make ex_bookings_no_overlap block on either booking status column
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+The availability and overlap queries treat a booking as blocking when status
+or booking_status is live; the constraint now uses the same predicate.
+Fails if existing bookings that only booking_status marks as live overlap;
+cancel or move them and rerun.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _replace_constraint(predicate: str) -> None:
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT IF EXISTS ex_bookings_no_overlap")
+    op.execute(
+        "ALTER TABLE bookings ADD CONSTRAINT ex_bookings_no_overlap "
+        "EXCLUDE USING gist (individual_court_id WITH =, slot_range WITH &&) "
+        f"WHERE ({predicate})"
+    )
+
+
+def upgrade() -> None:
+    _replace_constraint(
+        "status IN ('pending', 'active', 'confirmed') "
+        "OR booking_status IN ('pending', 'active', 'confirmed')"
+    )
+
+
+def downgrade() -> None:
+    _replace_constraint("status IN ('pending', 'active', 'confirmed')")
@@ -1,20 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.security import verify_password, create_access_token, get_password_hash
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.core.password_hasher import (
+    PasswordHasherBusy,
+    hash_password_async,
+    hasher_busy_exception,
+    verify_and_update_async,
+)
+from app.core.security import create_access_token
 from app.models.user import User
 from app.schemas.user import UserLogin, UserRegister, Token
 
 router = APIRouter()
 
+
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     
     # Clean email
     email = user_data.email.strip().lower()
     
     # Find user
-    user = db.query(User).filter(User.email == email).first()
+    user = (await db.execute(select(User).where(User.email == email))).scalars().first()
     
     if not user:
         raise HTTPException(
@@ -22,12 +30,22 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
             detail="Email không tồn tại"  
         )
     
-    # Verify password
-    if not verify_password(user_data.password, user.hashed_password):
+    # Verify password off the event loop
+    try:
+        verified, new_hash = await verify_and_update_async(user_data.password, user.hashed_password)
+    except PasswordHasherBusy:
+        raise hasher_busy_exception()
+
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Mật khẩu không chính xác" 
         )
+
+    # Upgrade hashes made with an older cost factor
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     
     # Check if active
     if not user.is_active:
@@ -37,7 +55,7 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Create token
-    access_token = create_access_token(data={"sub": user.email})
+    access_token = create_access_token(data={"sub": user.email, "uid": user.id})
     
    
     
@@ -60,13 +78,13 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
     }
 
 @router.post("/register", response_model=Token)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_async_db)):
     """Register new user"""
     
     # Clean email
     email = user_data.email.strip().lower()
     # Check if email exists
-    existing_user = db.query(User).filter(User.email == email).first()
+    existing_user = (await db.execute(select(User).where(User.email == email))).scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -82,7 +100,10 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    try:
+        hashed_password = await hash_password_async(user_data.password)
+    except PasswordHasherBusy:
+        raise hasher_busy_exception()
     
     new_user = User(
         email=email,
@@ -94,11 +115,11 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     # Create token
-    access_token = create_access_token(data={"sub": new_user.email})
+    access_token = create_access_token(data={"sub": new_user.email, "uid": new_user.id})
     
     return {
         "access_token": access_token,
@@ -6,14 +6,13 @@ from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from app.core.database import get_db, SessionLocal
 from app.core.security import get_current_user, get_current_owner
 from app.models.user import User
 from app.models.court import PaymentMethod, BookingInvite
 from app.models.friend import Friendship
-from app.models.notification import Notification
 from app.schemas.court import (
     BookingCreate,
     Booking,
@@ -35,9 +34,11 @@ from app.schemas.court import (
 )
 from app.crud import court as court_crud
 from app.crud import friend as friend_crud
-from app.crud.user import get_user_by_id
-from app.crud.notification import create_notification
+from app.crud.loaders import load_booking_venue, load_court, load_individual_court, load_user, prime_booking_venues
+from app.crud.notification import create_notification, mark_notifications_read
 from app.core.vietqr_service import VietQRService
+from app.core.pricing import get_price_table
+from app.core.timeslots import time_to_minutes
 from app.core.booking_qr_service import (
     generate_booking_access_token,
     decode_booking_access_token,
@@ -125,8 +126,10 @@ def _get_effective_history_status(booking) -> str:
 
     if status_value in {"active", "confirmed"}:
         try:
-            booking_end_time = datetime.strptime(booking.end_time, "%H:%M").time()
-            booking_end_datetime = datetime.combine(booking.booking_date.date(), booking_end_time)
+            end_minute = booking.end_minute
+            if end_minute is None:
+                end_minute = time_to_minutes(booking.end_time)
+            booking_end_datetime = datetime.combine(booking.booking_date.date(), datetime.min.time()) + timedelta(minutes=end_minute)
             if booking_end_datetime <= datetime.now():
                 return "completed"
         except Exception:
@@ -206,12 +209,7 @@ def _respond_to_booking_invite(invite: BookingInvite, current_user: User, action
     if action == "accept" and invite.invitee_user_id:
         _increment_friendship_streak(db, invite.inviter_user_id, invite.invitee_user_id)
 
-    db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.type == "booking_invite_received",
-        Notification.related_id == invite.id,
-        Notification.is_read.is_(False),
-    ).update({"is_read": True}, synchronize_session=False)
+    mark_notifications_read(db, current_user.id, "booking_invite_received", invite.id)
 
     db.commit()
     db.refresh(invite)
@@ -241,49 +239,6 @@ def _respond_to_booking_invite(invite: BookingInvite, current_user: User, action
     }
 
 
-def calculate_multi_tier_price(start_time: str, end_time: str, time_slots: list) -> float:
-    """
-    Calculate price for multi-tier time slots.
-    
-    Similar to frontend calculation: iterate through 30-minute intervals
-    and sum up prices for each interval that falls into a time slot tier.
-    """
-    if not time_slots:
-        return 0.0
-    
-    from datetime import datetime as dt, timedelta
-    
-    # Parse times
-    start_dt = dt.strptime(start_time, "%H:%M")
-    end_dt = dt.strptime(end_time, "%H:%M")
-    
-    total_price = 0.0
-    current_time = start_dt
-    
-    # Iterate through 30-minute intervals (0.5 hour each)
-    while current_time < end_dt:
-        next_time = current_time + timedelta(minutes=30)
-        
-        # Find which time_slot this interval belongs to
-        for slot in time_slots:
-            slot_start_str = slot.get("start_time", "")
-            slot_end_str = slot.get("end_time", "")
-            slot_price = slot.get("price", 0)
-            
-            slot_start = dt.strptime(slot_start_str, "%H:%M")
-            slot_end = dt.strptime(slot_end_str, "%H:%M")
-            
-            # Check if current interval starts within this slot
-            if current_time >= slot_start and current_time < slot_end:
-                # Add price for this 30-minute interval (0.5 hour)
-                total_price += slot_price * 0.5
-                break
-        
-        current_time = next_time
-    
-    return total_price
-
-
 @router.post("/payment-preview", response_model=PaymentInfo)
 async def get_payment_preview(
     preview_data: PaymentPreviewRequest,
@@ -295,20 +250,26 @@ async def get_payment_preview(
 
     Booking will only be created when user presses Complete on payment step.
     """
-    court = court_crud.get_court(db, preview_data.court_id)
+    court = load_court(db, preview_data.court_id)
     if not court:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Không tìm thấy thông tin sân"
         )
 
-    available_courts = court_crud.find_available_courts(
-        db,
-        court.id,
-        preview_data.booking_date,
-        preview_data.start_time,
-        preview_data.end_time,
-    )
+    try:
+        available_courts = court_crud.find_available_courts(
+            db,
+            court.id,
+            preview_data.booking_date,
+            preview_data.start_time,
+            preview_data.end_time,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid time format. Use HH:MM",
+        )
 
     if not available_courts:
         raise HTTPException(
@@ -316,7 +277,7 @@ async def get_payment_preview(
             detail="Tất cả sân đã có lịch đặt trong khung giờ này. Vui lòng chọn khung giờ khác.",
         )
 
-    owner = get_user_by_id(db, court.owner_id)
+    owner = load_user(db, court.owner_id)
     if not owner or not owner.bank_account_number or not owner.bank_code:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -324,10 +285,9 @@ async def get_payment_preview(
         )
 
     # Calculate amount using multi-tier pricing (same as frontend)
-    amount = calculate_multi_tier_price(
-        preview_data.start_time,
-        preview_data.end_time,
-        court.time_slots or []
+    amount = get_price_table(court).price(
+        time_to_minutes(preview_data.start_time),
+        time_to_minutes(preview_data.end_time),
     )
 
     if amount <= 0:
@@ -433,11 +393,11 @@ async def get_booking(
     
     # If owner, check if booking belongs to their court
     if current_user.role == "owner":
-        individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
+        individual_court = load_individual_court(db, booking.individual_court_id)
         if not individual_court:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Không tìm thấy sân")
         
-        parent_court = court_crud.get_court(db, individual_court.court_id)
+        parent_court = load_court(db, individual_court.court_id)
         if not parent_court or parent_court.owner_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -540,11 +500,11 @@ async def manual_verify_payment(
         )
     
     # Check if owner owns the court
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
+    individual_court = load_individual_court(db, booking.individual_court_id)
     if not individual_court:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Không tìm thấy sân")
     
-    parent_court = court_crud.get_court(db, individual_court.court_id)
+    parent_court = load_court(db, individual_court.court_id)
     if not parent_court:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Không tìm thấy sân")
     
@@ -594,11 +554,11 @@ async def confirm_payment(
         )
     
     # Check if owner owns the court
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
+    individual_court = load_individual_court(db, booking.individual_court_id)
     if not individual_court:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Không tìm thấy sân")
     
-    parent_court = court_crud.get_court(db, individual_court.court_id)
+    parent_court = load_court(db, individual_court.court_id)
     if not parent_court:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Không tìm thấy sân")
     
@@ -609,6 +569,10 @@ async def confirm_payment(
             detail="Bạn không có quyền xác nhận booking này"
         )
     
+    # Read names now: the commit below expires the loaded courts.
+    court_name = parent_court.name
+    individual_court_name = individual_court.name
+
     # Update booking status to active
     booking.status = "active"
     booking.booking_status = "active"
@@ -618,14 +582,11 @@ async def confirm_payment(
     db.refresh(booking)
 
     # Build email payload and send it in the background so the request returns quickly.
-    customer = get_user_by_id(db, booking.user_id)
+    customer = load_user(db, booking.user_id)
     customer_email = booking.customer_email or (customer.email if customer else None)
     customer_name = booking.customer_name or (customer.full_name if customer else "Khách hàng")
 
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
-    parent_court = court_crud.get_court(db, individual_court.court_id) if individual_court else None
-
-    if customer_email and individual_court and parent_court:
+    if customer_email:
         token = generate_booking_access_token(booking.id)
         booking_info_url = build_booking_info_url(token)
         qr_image_url = build_qr_image_url(booking_info_url)
@@ -640,8 +601,8 @@ async def confirm_payment(
             customer_name,
             booking_info_url,
             qr_image_url,
-            parent_court.name,
-            individual_court.name,
+            court_name,
+            individual_court_name,
             booking_date_str,
             booking.start_time,
             booking.end_time,
@@ -649,7 +610,7 @@ async def confirm_payment(
         )
         booking.payment_note = "EMAIL_QUEUED"
     else:
-        booking.payment_note = "EMAIL_FAILED: Missing customer email or court information"
+        booking.payment_note = "EMAIL_FAILED: Missing customer email"
 
     db.commit()
     db.refresh(booking)
@@ -677,10 +638,9 @@ async def view_booking_from_qr(
             detail="Booking not found"
         )
 
-    customer = get_user_by_id(db, booking.user_id)
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
-    parent_court = court_crud.get_court(db, individual_court.court_id) if individual_court else None
-    owner = get_user_by_id(db, parent_court.owner_id) if parent_court else None
+    customer = load_user(db, booking.user_id)
+    individual_court, parent_court = load_booking_venue(db, booking)
+    owner = load_user(db, parent_court.owner_id) if parent_court else None
 
     booking_date_str = booking.booking_date.strftime("%d/%m/%Y") if booking.booking_date else "N/A"
     total_price_str = f"{int(float(booking.total_price or 0)):,}".replace(",", ".")
@@ -724,10 +684,10 @@ async def get_my_bookings_history(
     bookings = court_crud.get_bookings_by_user(db, current_user.id)
     result: List[UserBookingHistoryItem] = []
     has_status_updates = False
+    prime_booking_venues(db, bookings)
 
     for booking in bookings:
-        individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
-        parent_court = court_crud.get_court(db, individual_court.court_id) if individual_court else None
+        individual_court, parent_court = load_booking_venue(db, booking)
 
         if parent_court:
             location = f"{parent_court.address}, {parent_court.district}, {parent_court.city}"
@@ -820,9 +780,8 @@ async def preview_booking_invite_code(
     if not booking:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
 
-    inviter = get_user_by_id(db, invite.inviter_user_id)
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
-    parent_court = court_crud.get_court(db, individual_court.court_id) if individual_court else None
+    inviter = load_user(db, invite.inviter_user_id)
+    individual_court, parent_court = load_booking_venue(db, booking)
 
     if invite.inviter_user_id == current_user.id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="You cannot use your own invite code")
@@ -926,8 +885,7 @@ async def send_booking_invite_to_friend(
     db.commit()
     db.refresh(invite)
 
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
-    parent_court = court_crud.get_court(db, individual_court.court_id) if individual_court else None
+    individual_court, parent_court = load_booking_venue(db, booking)
     court_name = parent_court.name if parent_court else "your booking"
 
     create_notification(
@@ -986,10 +944,9 @@ async def get_booking_invite_details(
     if not booking:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
 
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
-    parent_court = court_crud.get_court(db, individual_court.court_id) if individual_court else None
-    inviter = get_user_by_id(db, invite.inviter_user_id)
-    invitee = get_user_by_id(db, invite.invitee_user_id) if invite.invitee_user_id else None
+    individual_court, parent_court = load_booking_venue(db, booking)
+    inviter = load_user(db, invite.inviter_user_id)
+    invitee = load_user(db, invite.invitee_user_id) if invite.invitee_user_id else None
 
     location = (
         f"{parent_court.address}, {parent_court.district}, {parent_court.city}"
@@ -1053,11 +1010,11 @@ async def update_booking(
             )
     
     if current_user.role == "owner":
-        individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
+        individual_court = load_individual_court(db, booking.individual_court_id)
         if not individual_court:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Không tìm thấy sân")
         
-        parent_court = court_crud.get_court(db, individual_court.court_id)
+        parent_court = load_court(db, individual_court.court_id)
         if not parent_court or parent_court.owner_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional, Union
 from datetime import datetime
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import json
-from app.core.database import get_db
+from pydantic import TypeAdapter
+from app.core.catalog_cache import read_through
+from app.core.database import get_async_db, get_db
+from app.core.http_cache import CATALOG_CACHE_CONTROL, cached_json_response
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.pricing import quote_courts
 from app.core.security import get_current_user
+from app.core.timeslots import SLOT_MINUTES, time_to_minutes
 from app.models.user import User
 from app.schemas.court import (
     Court,
     CourtCreate,
     CourtUpdate,
     CourtWithIndividualCourts,
+    CourtDayAvailability,
+    FreeWindowSearchResponse,
     IndividualCourt,
     IndividualCourtUpdate,
     IndividualCourtWithBookings,
@@ -19,12 +28,17 @@ from app.schemas.court import (
     BookingCreate,
     BookingUpdate,
     BookingDetail,
+    OwnerBookingCompact,
     OwnerBookingsSummary,
+    OwnerAnalytics,
 )
 from app.crud import court as court_crud
+from app.crud.loaders import load_court, load_individual_court
 
 router = APIRouter()
 
+_court_list_adapter = TypeAdapter(List[Court])
+
 try:
     LOCAL_TIMEZONE = ZoneInfo("Asia/Ho_Chi_Minh")
 except ZoneInfoNotFoundError:
@@ -64,16 +78,15 @@ async def create_court(
 
 @router.get("/courts", response_model=List[Court])
 async def list_courts(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     booking_date: Optional[str] = Query(None, description="Booking date in YYYY-MM-DD"),
     start_time: Optional[str] = Query(None, description="Start time in HH:MM"),
     end_time: Optional[str] = Query(None, description="End time in HH:MM"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all courts"""
-    courts = court_crud.get_courts(db, skip=skip, limit=limit)
-
     # Optional availability filter by date and time range.
     has_availability_filter = booking_date or start_time or end_time
     if has_availability_filter:
@@ -121,29 +134,27 @@ async def list_courts(
                 detail="start_time must be later than current time for today",
             )
 
-        filtered_courts = []
-        for court in courts:
-            if not court.is_active:
-                continue
-
-            # Requested range must be inside venue operating hours.
-            if start_time < court.opening_time or end_time > court.closing_time:
-                continue
-
-            available_courts = court_crud.find_available_courts(
-                db=db,
-                court_id=court.id,
-                booking_date=parsed_booking_date,
-                start_time=start_time,
-                end_time=end_time,
-            )
+        available_courts = await court_crud.get_available_courts_async(
+            db,
+            booking_date=parsed_booking_date,
+            start_time=start_time,
+            end_time=end_time,
+            skip=skip,
+            limit=limit,
+        )
 
-            if available_courts:
-                filtered_courts.append(court)
+        quotes = quote_courts(available_courts, start_time, end_time)
+        for court in available_courts:
+            setattr(court, "quoted_price", quotes[court.id])
 
-        return filtered_courts
+        return available_courts
 
-    return courts
+    async def build_catalog_page() -> bytes:
+        courts = await court_crud.get_courts_async(db, skip=skip, limit=limit)
+        return _court_list_adapter.dump_json(_court_list_adapter.validate_python(courts, from_attributes=True))
+
+    body = await read_through(("list", skip, limit), build_catalog_page)
+    return cached_json_response(request, body, CATALOG_CACHE_CONTROL)
 
 
 @router.get("/courts/my", response_model=List[CourtWithIndividualCourts])
@@ -165,16 +176,23 @@ async def list_my_courts(
 @router.get("/courts/{court_id}", response_model=CourtWithIndividualCourts)
 async def get_court(
     court_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific court by ID"""
-    court = court_crud.get_court(db, court_id)
-    if not court:
+    async def build_court_detail() -> Optional[bytes]:
+        court = await court_crud.get_court_with_details_async(db, court_id)
+        if not court:
+            return None
+        return CourtWithIndividualCourts.model_validate(court).model_dump_json().encode()
+
+    body = await read_through(("detail", court_id), build_court_detail)
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Court not found",
         )
-    return court
+    return cached_json_response(request, body, CATALOG_CACHE_CONTROL)
 
 
 @router.put("/courts/{court_id}", response_model=Court)
@@ -243,6 +261,110 @@ async def list_individual_courts(
     return individual_courts
 
 
+@router.get("/courts/{court_id}/availability", response_model=CourtDayAvailability)
+async def get_court_day_availability(
+    court_id: int,
+    response: Response,
+    booking_date: str = Query(..., description="Booking date in YYYY-MM-DD"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Get the half-hour slot grid of every individual court for one date.
+
+    Each court carries a hex bitmap where bit i is set when the slot starting at
+    i * slot_minutes is already booked (or the court is inactive).
+    """
+    try:
+        parsed_booking_date = datetime.strptime(booking_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid booking_date format. Use YYYY-MM-DD",
+        )
+
+    court = await court_crud.get_court_async(db, court_id)
+    if not court:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Court not found",
+        )
+
+    response.headers["Cache-Control"] = "public, max-age=15"
+    return await court_crud.get_day_availability_async(db, court_id, parsed_booking_date)
+
+
+@router.get("/courts/{court_id}/free-windows", response_model=FreeWindowSearchResponse)
+async def find_court_free_windows(
+    court_id: int,
+    start_date: str = Query(..., description="First date in YYYY-MM-DD"),
+    end_date: Optional[str] = Query(None, description="Last date in YYYY-MM-DD (defaults to start_date)"),
+    duration_minutes: int = Query(60, ge=SLOT_MINUTES, le=24 * 60),
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """
+    Find the cheapest free windows of duration_minutes at a venue over a date range.
+
+    A window is returned when at least one active individual court is free for
+    the whole window. Results are sorted by price, then date and start time.
+    """
+    try:
+        parsed_start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        parsed_end_date = datetime.strptime(end_date, "%Y-%m-%d").date() if end_date else parsed_start_date
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid date format. Use YYYY-MM-DD",
+        )
+
+    if parsed_end_date < parsed_start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be on or after start_date",
+        )
+
+    if (parsed_end_date - parsed_start_date).days > 30:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range must not exceed 31 days",
+        )
+
+    if duration_minutes % SLOT_MINUTES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"duration_minutes must be a multiple of {SLOT_MINUTES}",
+        )
+
+    today_local = datetime.now(LOCAL_TIMEZONE).date()
+    if parsed_end_date < today_local:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot search availability in the past",
+        )
+    parsed_start_date = max(parsed_start_date, today_local)
+
+    court = court_crud.get_court(db, court_id)
+    if not court:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Court not found",
+        )
+
+    windows = court_crud.find_free_windows(
+        db,
+        court,
+        parsed_start_date,
+        parsed_end_date,
+        duration_minutes,
+        limit=limit,
+    )
+    return {
+        "court_id": court_id,
+        "duration_minutes": duration_minutes,
+        "windows": windows,
+    }
+
+
 @router.put("/individual-courts/{individual_court_id}", response_model=IndividualCourt)
 async def update_individual_court(
     individual_court_id: int,
@@ -251,7 +373,7 @@ async def update_individual_court(
     current_user: User = Depends(get_current_user),
 ):
     """Update an individual court (owner only)"""
-    individual_court = court_crud.get_individual_court(db, individual_court_id)
+    individual_court = load_individual_court(db, individual_court_id)
     if not individual_court:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -259,7 +381,7 @@ async def update_individual_court(
         )
     
     # Check ownership
-    court = court_crud.get_court(db, individual_court.court_id)
+    court = load_court(db, individual_court.court_id)
     if court.owner_id != current_user.id and current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -283,7 +405,7 @@ async def create_booking_legacy(
 ):
     """Create a new booking (Legacy endpoint for owner manual bookings)"""
     # Check if individual court exists
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
+    individual_court = load_individual_court(db, booking.individual_court_id)
     if not individual_court:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -294,19 +416,29 @@ async def create_booking_legacy(
     # Otherwise, user is creating booking for themselves
     if current_user.role == "owner":
         # Check if the court belongs to this owner
-        court = court_crud.get_court(db, individual_court.court_id)
+        court = load_court(db, individual_court.court_id)
         if not court or court.owner_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="You don't own this court",
             )
+
+    # Validate up front: the conflict handler below re-runs the time parsing.
+    try:
+        time_to_minutes(booking.start_time)
+        time_to_minutes(booking.end_time)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid time format. Use HH:MM",
+        )
     
     try:
         db_booking = court_crud.create_booking(db, booking, current_user.id)
         return db_booking
     except ValueError as e:
         # Find available alternative courts
-        court = court_crud.get_court(db, individual_court.court_id)
+        court = load_court(db, individual_court.court_id)
         available_courts = court_crud.find_available_courts(
             db, 
             court.id, 
@@ -361,8 +493,8 @@ async def update_booking(
         )
     
     # Only the booking owner or court owner can update
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
-    court = court_crud.get_court(db, individual_court.court_id)
+    individual_court = load_individual_court(db, booking.individual_court_id)
+    court = load_court(db, individual_court.court_id)
     
     if booking.user_id != current_user.id and court.owner_id != current_user.id and current_user.role != "admin":
         raise HTTPException(
@@ -395,8 +527,8 @@ async def delete_booking(
         )
     
     # Only the booking owner or court owner can delete
-    individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
-    court = court_crud.get_court(db, individual_court.court_id)
+    individual_court = load_individual_court(db, booking.individual_court_id)
+    court = load_court(db, individual_court.court_id)
     
     if booking.user_id != current_user.id and court.owner_id != current_user.id and current_user.role != "admin":
         raise HTTPException(
@@ -408,19 +540,29 @@ async def delete_booking(
 
 
 # Owner booking management endpoints
-@router.get("/owner/bookings", response_model=List[BookingDetail])
+@router.get(
+    "/owner/bookings",
+    response_model=Union[List[BookingDetail], List[OwnerBookingCompact]],
+)
 async def list_owner_bookings(
+    response: Response,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     court_id: Optional[int] = Query(None, description="Filter by court complex ID"),
     individual_court_id: Optional[int] = Query(None, description="Filter by individual court ID"),
     status: Optional[str] = Query(None, description="Filter by status: active, completed, cancelled"),
+    view: Literal["full", "compact"] = Query("full", description="full: nested booking details, compact: flat schedule rows"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size; omit to return every booking"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
     Get all bookings for courts owned by the current owner.
     Supports filtering by date range, court, and status.
+
+    With limit set, results are paged by keyset on (booking_date desc, start_time, id);
+    the X-Next-Cursor response header carries the cursor of the next page.
     """
     # Only owners can access this endpoint
     if current_user.role != "owner":
@@ -452,33 +594,48 @@ async def list_owner_bookings(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid end_date format. Use YYYY-MM-DD",
             )
-    
-    # Get bookings
-    bookings = court_crud.get_bookings_by_owner(
+
+    after = None
+    if cursor:
+        try:
+            after = tuple(decode_cursor(cursor, 3))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    load_bookings = court_crud.get_owner_booking_rows if view == "compact" else court_crud.get_bookings_by_owner
+    bookings = load_bookings(
         db,
         owner_id=current_user.id,
         start_date=start_datetime,
         end_date=end_datetime,
         court_id=court_id,
         individual_court_id=individual_court_id,
-        status=status
+        status=status,
+        after=after,
+        limit=limit,
     )
-    
-    # Enrich booking data with court info
-    booking_details = []
-    for booking in bookings:
-        individual_court = court_crud.get_individual_court(db, booking.individual_court_id)
-        court = court_crud.get_court(db, individual_court.court_id)
-        
-        booking_detail = BookingDetail(
-            **booking.__dict__,
-            individual_court=individual_court,
-            user=booking.user,
-            court_name=court.name
+
+    if limit and len(bookings) == limit:
+        last_booking = bookings[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            last_booking.booking_date,
+            last_booking.start_time,
+            last_booking.id,
         )
-        booking_details.append(booking_detail)
-    
-    return booking_details
+
+    if view == "compact":
+        return [OwnerBookingCompact.model_validate(row) for row in bookings]
+
+    # individual_court, court and user are eager-loaded by get_bookings_by_owner.
+    return [
+        BookingDetail.model_validate(booking).model_copy(
+            update={"court_name": booking.individual_court.court.name}
+        )
+        for booking in bookings
+    ]
 
 
 @router.get("/owner/bookings/summary", response_model=OwnerBookingsSummary)
@@ -499,3 +656,60 @@ async def get_owner_bookings_summary(
     summary = court_crud.get_owner_bookings_summary(db, current_user.id)
     return summary
 
+
+@router.get("/owner/analytics", response_model=OwnerAnalytics)
+async def get_owner_analytics(
+    start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
+    end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
+    granularity: Literal["day", "week", "month"] = Query("day"),
+    group_by: Literal["venue", "individual_court"] = Query("venue"),
+    court_id: Optional[int] = Query(None, description="Filter by court complex ID"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get revenue, hours sold and occupancy rate of the owner's courts per
+    day/week/month, grouped per venue or per individual court.
+
+    Figures reflect committed bookings immediately on the worker that wrote
+    them and, with REDIS_URL set, on every worker; without Redis other workers
+    may lag by up to ANALYTICS_CACHE_TTL_SECONDS (300s by default).
+    """
+    # Only owners can access this endpoint
+    if current_user.role != "owner":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only court owners can access this endpoint",
+        )
+
+    try:
+        parsed_start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        parsed_end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid date format. Use YYYY-MM-DD",
+        )
+
+    if parsed_end_date < parsed_start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="end_date must be on or after start_date",
+        )
+
+    if (parsed_end_date - parsed_start_date).days > 366:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range must not exceed 367 days",
+        )
+
+    return court_crud.get_owner_analytics(
+        db,
+        current_user.id,
+        parsed_start_date,
+        parsed_end_date,
+        granularity=granularity,
+        group_by=group_by,
+        court_id=court_id,
+    )
+
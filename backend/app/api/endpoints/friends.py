@@ -4,7 +4,7 @@ from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.user import User
-from app.models.notification import Notification
+from app.crud.notification import create_notifications, mark_notifications_read
 from app.schemas.friend import (
     FriendRequestCreate,
     FriendRequestCreateResponse,
@@ -57,12 +57,7 @@ async def respond_friend_request(
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
-    db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.type == "friend_request_received",
-        Notification.related_id == request_id,
-        Notification.is_read.is_(False),
-    ).update({"is_read": True}, synchronize_session=False)
+    mark_notifications_read(db, current_user.id, "friend_request_received", request_id)
     db.commit()
 
     return {
@@ -82,11 +77,15 @@ async def get_my_friends(
 
     friendships = friend_crud.list_friends(db, current_user.id)
     has_streak_updates = False
+    streak_warnings = []
     for friendship in friendships:
-        if friend_crud.refresh_friendship_streak_state(db, friendship):
+        if friend_crud.refresh_friendship_streak_state(db, friendship, streak_warnings):
             has_streak_updates = True
 
-    if has_streak_updates:
+    if streak_warnings:
+        # Commits the streak updates together with the warnings.
+        create_notifications(db, streak_warnings)
+    elif has_streak_updates:
         db.commit()
 
     items = []
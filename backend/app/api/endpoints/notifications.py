@@ -1,8 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
-from app.core.security import get_current_user
+from typing import List, Optional
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db, get_db
+from app.core.http_cache import (
+    ADVERTISEMENTS_CACHE_CONTROL,
+    PRIVATE_REVALIDATE_CACHE_CONTROL,
+    etag_matches,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from app.core.notification_bus import notification_bus
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.security import (
+    STREAM_TICKET_SCOPE,
+    authenticate_token_async,
+    create_stream_ticket,
+    get_current_user,
+    get_current_user_async,
+    optional_oauth2_scheme,
+)
 from app.models.user import User
 from app.schemas.notification import (
     Notification,
@@ -17,10 +37,14 @@ from app.schemas.notification import (
 from app.crud import notification as notification_crud
 from app.crud import court as court_crud
 from app.core.cloudinary_storage import upload_image_to_cloudinary
+import asyncio
 import json
 
 router = APIRouter()
 
+# Notifications sent per database read while catching up a stream.
+STREAM_BATCH_SIZE = 50
+
 
 def _json_load(value, fallback):
     if not value:
@@ -155,10 +179,17 @@ def _attach_click_counts(db: Session, requests: List[AdvertisementRequest]):
 
 @router.get("/advertisements/public", response_model=List[AdvertisementRequest])
 async def list_public_approved_advertisements(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     """Public endpoint for approved advertisements shown on home page."""
+    etag = make_etag("advertisements", *notification_crud.get_public_advertisements_version(db))
+    if etag_matches(request, etag):
+        return not_modified(etag, ADVERTISEMENTS_CACHE_CONTROL)
+
     requests = notification_crud.get_all_advertisement_requests(db, status="approved")
+    set_cache_headers(response, etag, ADVERTISEMENTS_CACHE_CONTROL)
     return _attach_click_counts(db, requests)
 
 
@@ -220,15 +251,19 @@ async def create_advertisement_request(
     from app.crud.user import get_users_by_role
 
     admins = get_users_by_role(db, "admin")
-    for admin in admins:
-        notification = NotificationCreate(
-            user_id=admin.id,
-            title="New Advertisement Request",
-            message=f"{current_user.full_name} submitted an advertisement request for '{name}'",
-            type="advertisement_request_created",
-            related_id=db_request.id,
-        )
-        notification_crud.create_notification(db, notification)
+    notification_crud.create_notifications(
+        db,
+        [
+            NotificationCreate(
+                user_id=admin.id,
+                title="New Advertisement Request",
+                message=f"{current_user.full_name} submitted an advertisement request for '{name}'",
+                type="advertisement_request_created",
+                related_id=db_request.id,
+            )
+            for admin in admins
+        ],
+    )
 
     return db_request
 
@@ -383,50 +418,186 @@ async def upload_images(
 # Notification endpoints
 @router.get("/notifications", response_model=List[Notification])
 async def get_my_notifications(
-    skip: int = 0,
-    limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    type: Optional[str] = Query(None, description="Only notifications of this type"),
+    is_read: Optional[bool] = Query(None, description="Only read (true) or unread (false) notifications"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    """Get all notifications for current user"""
-    return notification_crud.get_user_notifications(db, current_user.id, skip, limit)
+    """
+    Get notifications for current user, newest first.
+
+    Pages are keyset-based on (created_at, id): when a page is full the
+    X-Next-Cursor response header carries the cursor of the next page.
+    """
+    after = None
+    if cursor:
+        try:
+            after = tuple(decode_cursor(cursor, 2))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def notifications_etag(version: tuple) -> str:
+        return make_etag("notifications", current_user.id, skip, limit, cursor, type, is_read, *version)
+
+    # Only revalidating clients pay for the separate version probe.
+    if request.headers.get("if-none-match"):
+        version = await notification_crud.get_notifications_version_async(db, current_user.id)
+        etag = notifications_etag(version)
+        if etag_matches(request, etag):
+            return not_modified(etag, PRIVATE_REVALIDATE_CACHE_CONTROL, vary="Authorization")
+
+    notifications, version = await notification_crud.get_user_notifications_with_version_async(
+        db,
+        current_user.id,
+        skip=skip,
+        limit=limit,
+        after=after,
+        notification_type=type,
+        is_read=is_read,
+    )
+    set_cache_headers(response, notifications_etag(version), PRIVATE_REVALIDATE_CACHE_CONTROL, vary="Authorization")
+    if len(notifications) == limit:
+        last_notification = notifications[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_notification.created_at, last_notification.id)
+    return notifications
 
 
 @router.get("/notifications/unread-count")
 async def get_unread_count(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     """Get count of unread notifications"""
-    count = notification_crud.get_unread_count(db, current_user.id)
+    count = await notification_crud.get_unread_count_async(db, current_user.id)
     return {"count": count}
 
 
+def _sse_event(event: str, data: str, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+async def _notification_events(request: Request, user_id: int, after_id: Optional[int]):
+    # Subscribe first so nothing committed during the initial read is missed.
+    queue = notification_bus.subscribe(user_id)
+    try:
+        if after_id is None:
+            async with AsyncSessionLocal() as db:
+                _, _, newest_id = await notification_crud.get_notifications_version_async(db, user_id)
+            after_id = newest_id or 0
+
+        yield "retry: 5000\n\n"
+        last_unread = None
+        while True:
+            async with AsyncSessionLocal() as db:
+                new_notifications = await notification_crud.get_notifications_after_async(
+                    db, user_id, after_id, STREAM_BATCH_SIZE
+                )
+                unread = await notification_crud.get_unread_count_async(db, user_id)
+
+            for item in new_notifications:
+                after_id = item.id
+                yield _sse_event("notification", Notification.model_validate(item).model_dump_json(), event_id=item.id)
+            if unread != last_unread:
+                last_unread = unread
+                yield _sse_event("unread", json.dumps({"count": unread}))
+            if len(new_notifications) == STREAM_BATCH_SIZE:
+                continue
+
+            while True:
+                try:
+                    await asyncio.wait_for(queue.get(), timeout=settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS)
+                    break
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+    finally:
+        notification_bus.unsubscribe(user_id, queue)
+
+
+@router.post("/notifications/stream-ticket")
+async def create_notification_stream_ticket(current_user: User = Depends(get_current_user_async)):
+    """
+    Short-lived ticket for opening /notifications/stream from an EventSource,
+    which cannot send headers; the access token itself never goes in the URL.
+    """
+    return {
+        "ticket": create_stream_ticket(current_user),
+        "expires_in": settings.NOTIFICATION_STREAM_TICKET_TTL_SECONDS,
+    }
+
+
+@router.get("/notifications/stream")
+async def stream_notifications(
+    request: Request,
+    ticket: Optional[str] = Query(None, description="Ticket from POST /notifications/stream-ticket, for EventSource clients"),
+    last_event_id: Optional[int] = Query(None, description="Resume after this notification id"),
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+):
+    """
+    Server-sent events with the current user's notifications.
+
+    Authenticated by the Authorization header or, for EventSource clients, a
+    `ticket` (checked only when the stream opens; reconnect with a new one).
+
+    - `notification` events carry a new notification; the SSE id is its id
+    - `unread` events carry the unread count whenever it changes
+    - Reconnecting with Last-Event-ID (sent automatically by browsers) or
+      `last_event_id` replays everything newer than that id
+    """
+    if header_token:
+        user = await authenticate_token_async(header_token)
+    else:
+        user = await authenticate_token_async(ticket, scope=STREAM_TICKET_SCOPE)
+    resume_after = _parse_last_event_id(request.headers.get("last-event-id")) or last_event_id
+    return StreamingResponse(
+        _notification_events(request, user.id, resume_after),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.put("/notifications/{notification_id}/read", response_model=Notification)
 async def mark_notification_read(
     notification_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     """Mark a notification as read"""
-    notification = notification_crud.mark_as_read(db, notification_id)
+    notification = await notification_crud.get_notification_async(db, notification_id)
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
-    # Verify ownership
+    # Verify ownership before changing anything
     if notification.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    return notification
+    return await notification_crud.mark_as_read_async(db, notification)
 
 
 @router.post("/notifications/mark-all-read")
 async def mark_all_notifications_read(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     """Mark all notifications as read"""
-    notification_crud.mark_all_as_read(db, current_user.id)
+    await notification_crud.mark_all_as_read_async(db, current_user.id)
     return {"message": "All notifications marked as read"}
 
 
@@ -454,22 +625,26 @@ async def create_court_request(
     # Create notification for all admins
     from app.crud.user import get_users_by_role
     admins = get_users_by_role(db, "admin")
-    
-    for admin in admins:
-        admin_title = "Court update request" if is_update_request else "New court listing request"
-        admin_message = (
-            f"{current_user.full_name} submitted a court update request for '{request.name}'"
-            if is_update_request
-            else f"{current_user.full_name} submitted a new court listing request for '{request.name}'"
-        )
-        notification = NotificationCreate(
-            user_id=admin.id,
-            title=admin_title,
-            message=admin_message,
-            type="request_created",
-            related_id=db_request.id,
-        )
-        notification_crud.create_notification(db, notification)
+
+    admin_title = "Court update request" if is_update_request else "New court listing request"
+    admin_message = (
+        f"{current_user.full_name} submitted a court update request for '{request.name}'"
+        if is_update_request
+        else f"{current_user.full_name} submitted a new court listing request for '{request.name}'"
+    )
+    notification_crud.create_notifications(
+        db,
+        [
+            NotificationCreate(
+                user_id=admin.id,
+                title=admin_title,
+                message=admin_message,
+                type="request_created",
+                related_id=db_request.id,
+            )
+            for admin in admins
+        ],
+    )
     
     return db_request
 
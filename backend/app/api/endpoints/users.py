@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from app.core.database import get_db
+from app.core.password_hasher import PasswordHasherBusy, hasher_busy_exception
 from app.core.security import get_current_user, get_current_admin
 from app.models.user import User
 from app.models.notification import CourtRequest, AdvertisementRequest
@@ -57,7 +58,10 @@ async def update_current_user_profile(
                 detail="Email đã được sử dụng bởi tài khoản khác"
             )
     
-    user = crud_user.update_user(db, current_user.id, update_data)
+    try:
+        user = await crud_user.update_user(db, current_user.id, update_data)
+    except PasswordHasherBusy:
+        raise hasher_busy_exception()
     return user
 
 
@@ -99,7 +103,7 @@ async def upload_user_avatar(
         public_id_prefix=public_id,
     )
 
-    user = crud_user.update_user(db, current_user.id, {"avatar_url": new_avatar_url})
+    user = await crud_user.update_user(db, current_user.id, {"avatar_url": new_avatar_url})
 
     return user
 
@@ -296,7 +300,10 @@ async def update_user(
                 detail="Email đã được sử dụng bởi tài khoản khác"
             )
     
-    user = crud_user.update_user(db, user_id, update_data)
+    try:
+        user = await crud_user.update_user(db, user_id, update_data)
+    except PasswordHasherBusy:
+        raise hasher_busy_exception()
     return user
 
 @router.delete("/{user_id}")
@@ -317,16 +324,16 @@ async def test_password_hash(password: str):
     """
     Endpoint test để kiểm tra password hashing
     """
-    from app.core.security import get_password_hash, verify_password
+    from app.core.password_hasher import hash_password_async, verify_password_async
     
-    hashed = get_password_hash(password)
+    hashed = await hash_password_async(password)
     
     return {
         "original_password": password,
         "hashed_password": hashed,
         "hash_length": len(hashed),
         "is_bcrypt_format": hashed.startswith("$2b$"),
-        "verify_result": verify_password(password, hashed),
+        "verify_result": await verify_password_async(password, hashed),
         "info": {
             "algorithm": "bcrypt",
             "cost_factor": "12 (default)",
@@ -2,7 +2,6 @@
 Bank Transaction Verification Service
 Supports multiple Vietnamese banks for automatic payment verification
 """
-import httpx
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
@@ -98,6 +97,8 @@ class BankVerificationService:
         if not self.api_key:
             return []
             
+        import httpx
+
         try:
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.get(
@@ -0,0 +1,108 @@
+"""
+Small in-process caches shared by the CRUD layer.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from app.core.config import settings
+
+_redis_client = None
+_redis_checked = False
+_async_redis_client = None
+_async_redis_checked = False
+
+
+def get_redis_client():
+    """Return a Redis client when REDIS_URL is configured and redis is installed."""
+    global _redis_client, _redis_checked
+    if _redis_checked:
+        return _redis_client
+
+    _redis_checked = True
+    if not settings.REDIS_URL:
+        return None
+
+    try:
+        import redis
+    except ImportError:
+        print("REDIS_URL is set but the redis package is not installed; using in-process caches only")
+        return None
+
+    _redis_client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+    return _redis_client
+
+
+def get_async_redis_client():
+    """Return a redis.asyncio client for async handlers, under the same conditions as get_redis_client()."""
+    global _async_redis_client, _async_redis_checked
+    if _async_redis_checked:
+        return _async_redis_client
+
+    _async_redis_checked = True
+    if get_redis_client() is None:
+        return None
+
+    import redis.asyncio
+
+    _async_redis_client = redis.asyncio.Redis.from_url(
+        settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+    )
+    return _async_redis_client
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed number of seconds.
+
+    Each worker process has its own instance, so writers must invalidate the
+    entries they make stale and ttl_seconds bounds staleness across workers.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Delete every key for which predicate(key) is true and return the count."""
+        with self._lock:
+            stale_keys = [key for key in self._data if predicate(key)]
+            for key in stale_keys:
+                del self._data[key]
+            return len(stale_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
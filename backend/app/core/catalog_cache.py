@@ -0,0 +1,113 @@
+"""
+Read-through cache of serialized venue catalog and court detail responses.
+
+GET /courts and GET /courts/{court_id} are public and change only when a
+court, its individual courts or its owner's profile is written. Responses are
+stored as ready-to-send JSON bytes under a catalog version; writers call
+invalidate_court_catalog(), which bumps the version so every older entry
+becomes unreachable at once. Entries live in a worker-local TTLCache and, when
+REDIS_URL is set, in Redis together with the version so all workers agree.
+The async read path talks to Redis through redis.asyncio so a slow Redis never
+blocks the event loop; the sync client is only used by the sync writers.
+"""
+from typing import Awaitable, Callable, Hashable, Optional
+
+from app.core.cache import TTLCache, get_async_redis_client, get_redis_client
+from app.core.config import settings
+
+REDIS_KEY_PREFIX = "catalog:"
+REDIS_VERSION_KEY = "catalog:version"
+# With a shared backend, how long a worker trusts its copy of the version.
+SHARED_VERSION_TTL_SECONDS = 2
+
+_local_entries = TTLCache(settings.COURT_CATALOG_CACHE_TTL_SECONDS, maxsize=512)
+_local_version = TTLCache(SHARED_VERSION_TTL_SECONDS, maxsize=1)
+_version = 0
+
+
+async def _current_version() -> Optional[int]:
+    """Catalog version, or None when the shared backend cannot be read."""
+    client = get_async_redis_client()
+    if client is None:
+        return _version
+
+    version = _local_version.get("version")
+    if version is not None:
+        return version
+    try:
+        version = int(await client.get(REDIS_VERSION_KEY) or 0)
+    except Exception:
+        return None
+    _local_version.set("version", version)
+    return version
+
+
+def _redis_key(version: int, key: Hashable) -> str:
+    return f"{REDIS_KEY_PREFIX}{version}:" + ":".join(str(part) for part in key)
+
+
+async def get_cached(key: tuple, version: int) -> Optional[bytes]:
+    body = _local_entries.get((version, key))
+    if body is not None:
+        return body
+
+    client = get_async_redis_client()
+    if client is None:
+        return None
+    try:
+        body = await client.get(_redis_key(version, key))
+    except Exception:
+        return None
+    if body is not None:
+        _local_entries.set((version, key), body)
+    return body
+
+
+async def set_cached(key: tuple, version: int, body: bytes) -> None:
+    _local_entries.set((version, key), body)
+
+    client = get_async_redis_client()
+    if client is None:
+        return
+    try:
+        await client.set(_redis_key(version, key), body, ex=settings.COURT_CATALOG_CACHE_TTL_SECONDS)
+    except Exception:
+        pass
+
+
+async def read_through(key: tuple, build: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+    """
+    Return the cached body for key, building and storing it on a miss.
+
+    The version is read before building, so a write that lands while the
+    body is being built leaves it stored under the old, already stale version.
+    build() may return None (e.g. not found); None is never cached.
+    """
+    version = await _current_version()
+    if version is None:
+        return await build()
+
+    body = await get_cached(key, version)
+    if body is not None:
+        return body
+
+    body = await build()
+    if body is not None:
+        await set_cached(key, version, body)
+    return body
+
+
+def invalidate_court_catalog() -> None:
+    """Make every cached catalog page and court detail stale."""
+    global _version
+    _version += 1
+    _local_entries.clear()
+    _local_version.clear()
+
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.incr(REDIS_VERSION_KEY)
+    except Exception:
+        pass
@@ -3,8 +3,6 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Optional
 
-import cloudinary
-import cloudinary.uploader
 from fastapi import HTTPException, UploadFile, status
 
 from app.core.config import settings
@@ -17,6 +15,9 @@ def _ensure_cloudinary_configured() -> None:
             detail="Cloudinary is not configured. Missing CLOUDINARY_CLOUD_NAME/API_KEY/API_SECRET.",
         )
 
+    # The SDK is imported on first upload to keep it out of app startup.
+    import cloudinary
+
     cloudinary.config(
         cloud_name=settings.CLOUDINARY_CLOUD_NAME,
         api_key=settings.CLOUDINARY_API_KEY,
@@ -77,6 +78,8 @@ def upload_image_bytes_to_cloudinary(
         upload_kwargs["public_id"] = f"{public_id_prefix}{ext}"
         upload_kwargs["overwrite"] = True
 
+    import cloudinary.uploader
+
     try:
         result = cloudinary.uploader.upload(file_bytes, **upload_kwargs)
     except Exception as exc:
@@ -13,6 +13,18 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = "mizugakitsukasa1412"
     PGSSLMODE: str = "require"
 
+    # Connection pool settings. Each worker opens a sync (psycopg2) and an async
+    # (asyncpg) pool; its connection ceiling is the sum of both size + overflow.
+    DB_POOL_SIZE: int = 3
+    DB_MAX_OVERFLOW: int = 4
+    DB_ASYNC_POOL_SIZE: int = 3
+    DB_ASYNC_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # "session" or "transaction"; empty means transaction on pgbouncer's port 6543, session otherwise
+    DB_POOLER_MODE: Optional[str] = None
+
     # JWT Settings
     SECRET_KEY: str = "OceXRNLlufuBtERHT-pXEgsa_v5KFCA7Ny12PPDCOTI"
     ALGORITHM: str = "HS256"
@@ -45,6 +57,64 @@ class Settings(BaseSettings):
     SMTP_FROM_NAME: str = "Pickleball NP SPORTCLUB"
     SMTP_USE_TLS: bool = True
 
+    # Seconds a venue's day availability bitmap stays cached in each worker
+    AVAILABILITY_CACHE_TTL_SECONDS: int = 30
+
+    # Seconds a serialized court catalog page or court detail stays cached
+    COURT_CATALOG_CACHE_TTL_SECONDS: int = 300
+
+    # Seconds an owner's per-day booking aggregates stay cached in each worker
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300
+
+    # Password hashing pool: concurrent bcrypt jobs, jobs allowed to wait, bcrypt cost factor
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+
+    # Seconds an authenticated user principal stays cached
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    # Optional Redis shared by all workers, e.g. redis://localhost:6379/0
+    REDIS_URL: Optional[str] = None
+
+    # Worker processes serving the app (read by uvicorn/gunicorn too); set it
+    # whenever more than one worker runs
+    WEB_CONCURRENCY: int = 1
+
+    # Notification stream fan-out: "memory" (single worker), "postgres"
+    # (LISTEN/NOTIFY) or "auto" (postgres when WEB_CONCURRENCY > 1)
+    NOTIFICATION_BUS: str = "auto"
+    # Session-mode connection URL for LISTEN when DB_PORT is a transaction pooler
+    NOTIFICATION_LISTEN_URL: Optional[str] = None
+    # Seconds between keep-alive comments on idle notification streams
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: int = 25
+    # Lifetime of the ticket an EventSource uses to open a notification stream
+    NOTIFICATION_STREAM_TICKET_TTL_SECONDS: int = 60
+
+    # Notification retention (prune_notifications.py): days kept per type, with
+    # NOTIFICATION_RETENTION_DAYS for unlisted types; 0 keeps a type forever
+    NOTIFICATION_RETENTION_DAYS: int = 180
+    NOTIFICATION_RETENTION_POLICIES: dict[str, int] = {
+        "friend_streak_warning": 14,
+        "friend_streak_warning_digest": 90,
+        "requests_pending_summary": 30,
+    }
+    # Move expired rows to notifications_archive instead of deleting them
+    NOTIFICATION_RETENTION_ARCHIVE: bool = True
+    # Rows deleted/archived per transaction
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = 1000
+    # Days after which streak warnings are folded into one digest row per user
+    NOTIFICATION_DIGEST_AFTER_DAYS: int = 7
+
+    # Opt-in response pipeline: orjson rendering and Brotli/GZip compression
+    FAST_JSON_RESPONSES: bool = False
+    RESPONSE_COMPRESSION: bool = False
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+    RESPONSE_GZIP_LEVEL: int = 6
+    RESPONSE_BROTLI_QUALITY: int = 4
+
+    # Print a per-phase import/startup timing report when the app starts
+    STARTUP_PROFILE: bool = False
+
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, value: Any) -> list[str]:
@@ -1,17 +1,224 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from uuid import uuid4
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from app.core.config import settings
 
 # Tạo database URL từ settings
 SQLALCHEMY_DATABASE_URL = f"postgresql://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_DATABASE}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_DATABASE}"
+
+# Supabase/pgbouncer listens for transaction-mode pooling on this port.
+PGBOUNCER_TRANSACTION_PORT = "6543"
+
+
+def get_pooler_mode() -> str:
+    """Return "transaction" when connecting through a transaction-mode pooler, else "session"."""
+    mode = (settings.DB_POOLER_MODE or "").strip().lower()
+    if mode in {"session", "transaction"}:
+        return mode
+    return "transaction" if str(settings.DB_PORT) == PGBOUNCER_TRANSACTION_PORT else "session"
+
+
+class PoolMetrics:
+    """Counters for connection checkouts and time spent waiting for a free connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.waits += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "total_wait_seconds": round(self.total_wait_seconds, 6),
+                "max_wait_seconds": round(self.max_wait_seconds, 6),
+                "avg_wait_seconds": round(self.total_wait_seconds / self.waits, 6) if self.waits else 0.0,
+            }
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class _CheckoutTimingMixin:
+    """Records how long each checkout waited for a connection into self.metrics."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started_at, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started_at)
+        return connection
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool of the sync engine with checkout wait metrics."""
+
+    metrics = pool_metrics
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """Pool of the asyncpg engine with checkout wait metrics."""
+
+    metrics = async_pool_metrics
+
+
+def build_engine_options() -> dict:
+    """Engine keyword arguments derived from Settings."""
+    connect_args = {
+        "sslmode": settings.PGSSLMODE,
+        # Detect connections silently dropped by the pooler or a NAT.
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        "keepalives_interval": 10,
+        "keepalives_count": 5,
+    }
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+    if get_pooler_mode() == "transaction":
+        # pgbouncer hands each transaction to any server connection, so nothing
+        # may rely on session state such as server-side prepared statements
+        # (psycopg2 never creates them). The pooler keeps server connections
+        # warm, so client connections can be recycled sooner.
+        options["pool_recycle"] = min(settings.DB_POOL_RECYCLE, 300)
+
+    return options
+
+
+def build_async_engine_options() -> dict:
+    """asyncpg engine keyword arguments derived from Settings."""
+    options = build_engine_options()
+    options["poolclass"] = InstrumentedAsyncQueuePool
+    options["pool_size"] = settings.DB_ASYNC_POOL_SIZE
+    options["max_overflow"] = settings.DB_ASYNC_MAX_OVERFLOW
+    options["connect_args"] = {"ssl": settings.PGSSLMODE}
+
+    if get_pooler_mode() == "transaction":
+        # asyncpg prepares every statement server-side; behind pgbouncer the
+        # next transaction may run on a connection that never saw it.
+        options["connect_args"].update(
+            {
+                "statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        )
+
+    return options
+
+
+def _attach_pool_listeners(sync_engine, metrics: PoolMetrics) -> None:
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.increment("connects")
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.increment("checkouts")
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.increment("checkins")
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.increment("invalidations")
+
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL):
+    """Create the application engine with pool settings and metrics listeners attached."""
+    db_engine = create_engine(url, **build_engine_options())
+    _attach_pool_listeners(db_engine, pool_metrics)
+    return db_engine
+
+
+def create_async_db_engine(url: str = ASYNC_SQLALCHEMY_DATABASE_URL):
+    """Create the asyncpg engine used by async endpoints."""
+    db_engine = create_async_engine(url, **build_async_engine_options())
+    _attach_pool_listeners(db_engine.sync_engine, async_pool_metrics)
+    return db_engine
+
+
+def _describe_pool(pool, metrics: PoolMetrics) -> dict:
+    return {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        **metrics.snapshot(),
+    }
+
+
+def get_pool_status() -> dict:
+    """Current pool occupancy plus cumulative checkout/wait metrics."""
+    return {
+        "pooler_mode": get_pooler_mode(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout_seconds": settings.DB_POOL_TIMEOUT,
+        "max_connections": settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+        + settings.DB_ASYNC_POOL_SIZE + settings.DB_ASYNC_MAX_OVERFLOW,
+        **_describe_pool(engine.pool, pool_metrics),
+        "async": {
+            "max_overflow": settings.DB_ASYNC_MAX_OVERFLOW,
+            **_describe_pool(async_engine.pool, async_pool_metrics),
+        },
+    }
+
 
 # Tạo engine
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_db_engine()
 
 # Tạo SessionLocal
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine/session for async endpoints; rows stay usable after commit.
+async_engine = create_async_db_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Base class cho models
 Base = declarative_base()
 
@@ -20,4 +227,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
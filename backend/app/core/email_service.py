@@ -1,5 +1,3 @@
-import smtplib
-from email.message import EmailMessage
 from html import escape
 
 from app.core.config import settings
@@ -93,6 +91,10 @@ def send_booking_qr_email(
     </html>
     """.strip()
 
+    # smtplib and the email package are only needed once a mail is actually sent.
+    import smtplib
+    from email.message import EmailMessage
+
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = f"{settings.SMTP_FROM_NAME} <{settings.SMTP_FROM_EMAIL}>"
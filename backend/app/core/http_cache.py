@@ -0,0 +1,66 @@
+"""
+HTTP conditional request helpers (ETag / If-None-Match / Cache-Control).
+
+Routes derive a strong ETag either from a cheap version probe (an aggregate
+query over the rows behind the response) or from an already cached body, so a
+matching If-None-Match can be answered with 304 before the expensive query.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Public catalog data: browsers/CDNs may reuse it briefly, then revalidate.
+CATALOG_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=120"
+ADVERTISEMENTS_CACHE_CONTROL = "public, max-age=60, stale-while-revalidate=300"
+# Per-user data: never shared, always revalidated (cheap with a 304).
+PRIVATE_REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from version values (ids, counts, timestamps, ...)."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_for_body(body: bytes) -> str:
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match header matches etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return etag in candidates
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str, vary: Optional[str] = None) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if vary:
+        response.headers["Vary"] = vary
+
+
+def not_modified(etag: str, cache_control: str, vary: Optional[str] = None) -> Response:
+    response = Response(status_code=304)
+    set_cache_headers(response, etag, cache_control, vary)
+    return response
+
+
+def cached_json_response(
+    request: Request,
+    body: bytes,
+    cache_control: str,
+    vary: Optional[str] = None,
+) -> Response:
+    """200 with body, or 304 when the client already has this exact body."""
+    etag = etag_for_body(body)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control, vary)
+    response = Response(content=body, media_type="application/json")
+    set_cache_headers(response, etag, cache_control, vary)
+    return response
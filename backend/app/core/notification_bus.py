@@ -0,0 +1,200 @@
+"""
+Per-user pub/sub that wakes up open notification streams.
+
+Writers never talk to the bus directly: they call notify_user_changed(db,
+user_id) before committing, and the event is published once the transaction
+commits (dropped on rollback). Events only say "something changed for this
+user"; each stream then reads what is new from the database, which also makes
+resuming from a last-seen id the same code path as live delivery.
+
+NOTIFICATION_BUS selects how events reach the streams:
+
+- "memory": published to subscribers in this worker only. Refused at startup
+  when WEB_CONCURRENCY > 1, since streams on other workers would never wake.
+- "postgres": sent with pg_notify inside the committing transaction, and every
+  worker LISTENs on the channel, so streams on any worker wake up. LISTEN needs
+  a session-mode connection; set NOTIFICATION_LISTEN_URL when DB_PORT points
+  at a transaction-mode pooler.
+- "auto" (default): "postgres" when WEB_CONCURRENCY > 1, else "memory".
+"""
+import asyncio
+import json
+import threading
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+CHANNEL = "notification_events"
+PENDING_EVENTS_KEY = "pending_notification_events"
+# User ids per pg_notify payload; keeps payloads well under the 8000-byte limit.
+NOTIFY_BATCH_SIZE = 500
+LISTEN_RETRY_SECONDS = 5
+
+
+class NotificationBus:
+    """In-process subscribers keyed by user id; safe to publish from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[tuple]] = {}
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        # One pending wakeup is enough: the stream reads everything new anyway.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(user_id, set())
+            subscribers.difference_update({entry for entry in subscribers if entry[1] is queue})
+            if not subscribers:
+                self._subscribers.pop(user_id, None)
+
+    def publish(self, user_id: int) -> None:
+        self.publish_many((user_id,))
+
+    def publish_many(self, user_ids) -> None:
+        with self._lock:
+            subscribers = [entry for user_id in user_ids for entry in self._subscribers.get(user_id, ())]
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue)
+            except RuntimeError:
+                # Event loop already closed (worker shutting down).
+                pass
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+def _offer(queue: asyncio.Queue) -> None:
+    try:
+        queue.put_nowait(True)
+    except asyncio.QueueFull:
+        pass
+
+
+notification_bus = NotificationBus()
+
+
+def get_notification_bus_mode() -> str:
+    """Effective bus: "memory" or "postgres" ("auto" resolved from WEB_CONCURRENCY)."""
+    mode = (settings.NOTIFICATION_BUS or "auto").strip().lower()
+    if mode == "auto":
+        return "postgres" if settings.WEB_CONCURRENCY > 1 else "memory"
+    return mode
+
+
+def _uses_postgres() -> bool:
+    return get_notification_bus_mode() == "postgres"
+
+
+def notify_user_changed(db: Session, user_id: int) -> None:
+    """Queue a stream wakeup for user_id, delivered when db commits."""
+    db.info.setdefault(PENDING_EVENTS_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "before_commit")
+def _send_pg_notify(session) -> None:
+    if not _uses_postgres():
+        return
+    user_ids = session.info.get(PENDING_EVENTS_KEY)
+    if not user_ids:
+        return
+    # NOTIFY is transactional: listeners only see it if the commit succeeds.
+    user_ids = sorted(user_ids)
+    for start in range(0, len(user_ids), NOTIFY_BATCH_SIZE):
+        session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHANNEL, "payload": json.dumps({"user_ids": user_ids[start:start + NOTIFY_BATCH_SIZE]})},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session) -> None:
+    user_ids = session.info.pop(PENDING_EVENTS_KEY, None)
+    if not user_ids or _uses_postgres():
+        return
+    notification_bus.publish_many(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back(session) -> None:
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+class _PostgresListener:
+    """Background task relaying pg_notify events to this worker's bus."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    @staticmethod
+    def _on_notify(connection, pid, channel, payload) -> None:
+        try:
+            user_ids = [int(user_id) for user_id in json.loads(payload)["user_ids"]]
+        except (ValueError, KeyError, TypeError):
+            return
+        notification_bus.publish_many(user_ids)
+
+    async def _run(self) -> None:
+        import asyncpg
+        from app.core.database import SQLALCHEMY_DATABASE_URL
+
+        dsn = settings.NOTIFICATION_LISTEN_URL or SQLALCHEMY_DATABASE_URL
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn, ssl=settings.PGSSLMODE)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _connection: closed.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                await closed.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"Notification listener disconnected: {exc}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+
+_listener = _PostgresListener()
+
+
+async def start_notification_bus() -> None:
+    mode = get_notification_bus_mode()
+    if mode not in {"memory", "postgres"}:
+        raise RuntimeError(f"Unknown NOTIFICATION_BUS {settings.NOTIFICATION_BUS!r}; use auto, memory or postgres")
+    if mode == "memory" and settings.WEB_CONCURRENCY > 1:
+        raise RuntimeError(
+            "NOTIFICATION_BUS=memory cannot wake notification streams across "
+            f"{settings.WEB_CONCURRENCY} workers; use postgres (or auto)"
+        )
+    if mode == "postgres":
+        _listener.start()
+
+
+async def stop_notification_bus() -> None:
+    await _listener.stop()
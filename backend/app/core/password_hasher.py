@@ -0,0 +1,158 @@
+"""
+Bounded worker pool for bcrypt hashing and verification.
+
+bcrypt costs 100-300 ms of CPU per call. Running it on the event loop (or on
+Starlette's shared threadpool) lets a burst of logins stall every other
+request, so async callers submit the work to a small dedicated thread pool
+(bcrypt releases the GIL). At most PASSWORD_HASH_WORKERS jobs run at once and
+PASSWORD_HASH_QUEUE_SIZE more may wait; beyond that PasswordHasherBusy is
+raised so the endpoint can answer 503 instead of queueing without bound.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+class _HasherMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.max_run_seconds = 0.0
+        self.rehashed = 0
+
+    def try_acquire(self, capacity: int) -> bool:
+        with self._lock:
+            if self.in_flight >= capacity:
+                self.rejected += 1
+                return False
+            self.in_flight += 1
+            return True
+
+    def started(self, waited: float) -> None:
+        with self._lock:
+            self.running += 1
+            self.total_wait_seconds += waited
+
+    def finished(self, ran: float) -> None:
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+            self.total_run_seconds += ran
+            self.max_run_seconds = max(self.max_run_seconds, ran)
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def record_rehash(self) -> None:
+        with self._lock:
+            self.rehashed += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "workers": settings.PASSWORD_HASH_WORKERS,
+                "queue_capacity": settings.PASSWORD_HASH_QUEUE_SIZE,
+                "running": self.running,
+                "queued": self.in_flight - self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_wait_seconds": round(self.total_wait_seconds / self.completed, 6) if self.completed else 0.0,
+                "avg_hash_seconds": round(self.total_run_seconds / self.completed, 6) if self.completed else 0.0,
+                "max_hash_seconds": round(self.max_run_seconds, 6),
+            }
+
+
+hasher_metrics = _HasherMetrics()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    thread_name_prefix="password-hasher",
+                )
+    return _executor
+
+
+async def _run_bounded(func: Callable, *args):
+    capacity = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+    if not hasher_metrics.try_acquire(capacity):
+        raise PasswordHasherBusy()
+
+    submitted_at = time.perf_counter()
+
+    def job():
+        started_at = time.perf_counter()
+        hasher_metrics.started(started_at - submitted_at)
+        try:
+            return func(*args)
+        finally:
+            hasher_metrics.finished(time.perf_counter() - started_at)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), job)
+    finally:
+        hasher_metrics.release()
+
+
+def hasher_busy_exception() -> HTTPException:
+    """503 answered when PasswordHasherBusy is raised."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Hệ thống đang bận, vui lòng thử lại sau giây lát",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hasher pool."""
+    from app.core.security import get_password_hash
+
+    return await _run_bounded(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hasher pool."""
+    from app.core.security import verify_password
+
+    return await _run_bounded(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and, when its hash uses an outdated scheme or cost factor,
+    return a replacement hash computed with the current policy.
+    """
+    from app.core.security import pwd_context
+
+    verified, new_hash = await _run_bounded(pwd_context.verify_and_update, plain_password, hashed_password)
+    if verified and new_hash:
+        hasher_metrics.record_rehash()
+    return verified, new_hash
+
+
+def get_hasher_status() -> dict:
+    """Queue depth and latency of the password hasher in this worker."""
+    return hasher_metrics.snapshot()
@@ -0,0 +1,81 @@
+"""
+Venue pricing compiled from Court.time_slots.
+
+A venue's pricing tiers are compiled once into a per-minute table holding the
+price of a 30-minute interval that starts at that minute. Pricing a booking is
+then a strided slice-sum over the table instead of re-parsing every tier for
+every interval.
+"""
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.core.cache import TTLCache
+from app.core.timeslots import MINUTES_PER_DAY, SLOT_MINUTES, time_to_minutes
+
+# Compiled tables keyed by (court_id, court.updated_at).
+_price_table_cache = TTLCache(ttl_seconds=3600, maxsize=4096)
+
+
+class PriceTable:
+    """Price of the 30-minute interval starting at each minute of the day."""
+
+    __slots__ = ("interval_prices",)
+
+    def __init__(self, interval_prices: Sequence[float]):
+        self.interval_prices = interval_prices
+
+    def price(self, start_minutes: int, end_minutes: int) -> float:
+        """Total price of [start_minutes, end_minutes), billed per started 30-minute interval."""
+        if end_minutes <= start_minutes:
+            return 0.0
+        return sum(self.interval_prices[start_minutes:end_minutes:SLOT_MINUTES])
+
+    def price_many(self, windows: Iterable[Tuple[int, int]]) -> List[float]:
+        """Price many (start_minutes, end_minutes) windows at once."""
+        return [self.price(start, end) for start, end in windows]
+
+
+def compile_price_table(time_slots: Optional[list]) -> PriceTable:
+    """
+    Compile pricing tiers into a PriceTable.
+
+    An interval is billed at the first tier whose [start_time, end_time) contains
+    the interval start, matching the frontend calculation. Intervals outside every
+    tier, and malformed tiers, cost nothing.
+    """
+    interval_prices: List[Optional[float]] = [None] * MINUTES_PER_DAY
+
+    for slot in time_slots or []:
+        try:
+            slot_start = time_to_minutes(slot.get("start_time", ""))
+            slot_end = time_to_minutes(slot.get("end_time", ""))
+            interval_price = float(slot.get("price", 0)) * (SLOT_MINUTES / 60)
+        except (TypeError, ValueError):
+            continue
+
+        for minute in range(slot_start, min(slot_end, MINUTES_PER_DAY)):
+            if interval_prices[minute] is None:
+                interval_prices[minute] = interval_price
+
+    return PriceTable(tuple(price or 0.0 for price in interval_prices))
+
+
+def get_price_table(court) -> PriceTable:
+    """Get the compiled PriceTable of a Court, compiling it on first use."""
+    cache_key = (court.id, court.updated_at)
+    table = _price_table_cache.get(cache_key)
+    if table is None:
+        table = compile_price_table(court.time_slots)
+        _price_table_cache.set(cache_key, table)
+    return table
+
+
+def invalidate_price_table(court_id: int) -> None:
+    """Drop compiled pricing for a court after its time_slots change."""
+    _price_table_cache.delete_matching(lambda key: key[0] == court_id)
+
+
+def quote_courts(courts: Iterable, start_time: str, end_time: str) -> dict[int, float]:
+    """Price the same "HH:MM" window at many courts, keyed by court id."""
+    start_minutes = time_to_minutes(start_time)
+    end_minutes = time_to_minutes(end_time)
+    return {court.id: get_price_table(court).price(start_minutes, end_minutes) for court in courts}
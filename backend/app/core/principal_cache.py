@@ -0,0 +1,107 @@
+"""
+Cache of authenticated user principals keyed by user id.
+
+get_current_user resolves every authenticated request, so the user row is
+cached as plain column values (never the password hash) and re-attached to
+the request's session without a query. Each worker keeps an in-process
+TTLCache; when REDIS_URL is set the entries are also shared through Redis so
+invalidations reach every worker.
+"""
+import json
+from datetime import datetime
+from typing import Optional
+
+from app.core.cache import TTLCache, get_redis_client
+from app.core.config import settings
+
+# Columns never copied into the cache.
+EXCLUDED_PRINCIPAL_COLUMNS = {"hashed_password"}
+REDIS_KEY_PREFIX = "principal:"
+# With a shared backend, worker-local copies only absorb bursts.
+SHARED_LOCAL_TTL_SECONDS = 5
+
+_local_principals = TTLCache(settings.PRINCIPAL_CACHE_TTL_SECONDS, maxsize=10000)
+
+
+def _principal_columns():
+    from app.models.user import User
+
+    return [column for column in User.__table__.columns if column.key not in EXCLUDED_PRINCIPAL_COLUMNS]
+
+
+def snapshot_user(user) -> dict:
+    """Column values of a User, JSON-compatible."""
+    data = {}
+    for column in _principal_columns():
+        value = getattr(user, column.key)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif hasattr(value, "value"):
+            value = value.value
+        data[column.key] = value
+    return data
+
+
+def build_detached_user(data: dict):
+    """Rebuild a detached User from a snapshot, ready for Session.merge(load=False)."""
+    from sqlalchemy.orm import make_transient_to_detached
+    from app.models.user import User, UserRole
+
+    values = dict(data)
+    for key in ("created_at", "updated_at"):
+        if values.get(key):
+            values[key] = datetime.fromisoformat(values[key])
+    if values.get("role") is not None:
+        values["role"] = UserRole(values["role"])
+
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def get_principal(user_id: int) -> Optional[dict]:
+    data = _local_principals.get(user_id)
+    if data is not None:
+        return data
+
+    client = get_redis_client()
+    if client is None:
+        return None
+
+    try:
+        raw = client.get(f"{REDIS_KEY_PREFIX}{user_id}")
+    except Exception:
+        return None
+    if raw is None:
+        return None
+
+    data = json.loads(raw)
+    _local_principals.set(user_id, data, ttl_seconds=SHARED_LOCAL_TTL_SECONDS)
+    return data
+
+
+def set_principal(user) -> None:
+    data = snapshot_user(user)
+    client = get_redis_client()
+    if client is None:
+        _local_principals.set(user.id, data)
+        return
+
+    _local_principals.set(user.id, data, ttl_seconds=SHARED_LOCAL_TTL_SECONDS)
+    try:
+        client.set(f"{REDIS_KEY_PREFIX}{user.id}", json.dumps(data), ex=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+    except Exception:
+        pass
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop a cached principal after the user is updated, deactivated or deleted."""
+    _local_principals.delete(user_id)
+
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.delete(f"{REDIS_KEY_PREFIX}{user_id}")
+    except Exception:
+        pass
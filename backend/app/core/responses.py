@@ -0,0 +1,58 @@
+"""
+Opt-in response pipeline: fast JSON rendering and compression.
+
+Both parts are off by default and enabled from settings:
+
+- FAST_JSON_RESPONSES renders response_model output with orjson
+  (ORJSONResponse) instead of json.dumps. Requires `pip install orjson`.
+- RESPONSE_COMPRESSION compresses bodies of at least
+  RESPONSE_COMPRESSION_MIN_BYTES. Brotli is used for clients that accept it
+  when `brotli-asgi` is installed, otherwise gzip.
+
+Missing optional packages fall back to the defaults with a startup message.
+"""
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.core.config import settings
+
+
+def get_default_response_class():
+    """ORJSONResponse when fast JSON is enabled and orjson is installed, else JSONResponse."""
+    if not settings.FAST_JSON_RESPONSES:
+        return JSONResponse
+
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        print("FAST_JSON_RESPONSES is set but orjson is not installed; using the standard JSON encoder")
+        return JSONResponse
+    return ORJSONResponse
+
+
+def add_compression_middleware(app: FastAPI) -> None:
+    """Install Brotli/GZip compression when RESPONSE_COMPRESSION is enabled."""
+    if not settings.RESPONSE_COMPRESSION:
+        return
+
+    minimum_size = settings.RESPONSE_COMPRESSION_MIN_BYTES
+    try:
+        from brotli_asgi import BrotliMiddleware
+    except ImportError:
+        BrotliMiddleware = None
+
+    if BrotliMiddleware is not None:
+        # Falls back to gzip for clients that do not accept br.
+        app.add_middleware(
+            BrotliMiddleware,
+            quality=settings.RESPONSE_BROTLI_QUALITY,
+            minimum_size=minimum_size,
+            gzip_fallback=True,
+        )
+    else:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=minimum_size,
+            compresslevel=settings.RESPONSE_GZIP_LEVEL,
+        )
@@ -4,15 +4,31 @@ from typing import Optional
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_async_db, get_db
+from app.core.principal_cache import build_detached_user, get_principal, set_principal
 
 # Khởi tạo context để hash mật khẩu
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes below the configured cost factor are flagged for rehash on login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
+# Same, without the automatic 401, for endpoints that also accept a ?ticket= (EventSource)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login", auto_error=False)
+
+# Scope of the short-lived tickets that open notification streams. Tickets end
+# up in URLs (and so in access logs), so they only open streams and expire fast;
+# access tokens carry no scope and tickets are refused where those are expected.
+STREAM_TICKET_SCOPE = "notification_stream"
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     
@@ -41,46 +57,143 @@ def decode_access_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    """
-    Dependency to get current authenticated user from token.
-    """
-    from app.models.user import User
-    
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
-    try:
-        payload = decode_access_token(token)
-        if payload is None:
-            raise credentials_exception
-            
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-            
-    except JWTError:
-        raise credentials_exception
-    
-    user = db.query(User).filter(User.email == email).first()
+
+
+def create_stream_ticket(user) -> str:
+    """Short-lived token that only authenticates a notification stream."""
+    return create_access_token(
+        data={"sub": user.email, "uid": user.id, "scope": STREAM_TICKET_SCOPE},
+        expires_delta=timedelta(seconds=settings.NOTIFICATION_STREAM_TICKET_TTL_SECONDS),
+    )
+
+
+def _token_subject(token: str, scope: Optional[str] = None) -> tuple[str, Optional[int]]:
+    """
+    Return (email, user id) of a valid token of the given scope (None: access
+    token) or raise 401; older tokens carry no id.
+    """
+    payload = decode_access_token(token)
+    if payload is None or payload.get("scope") != scope:
+        raise _credentials_exception()
+
+    email: str = payload.get("sub")
+    if email is None:
+        raise _credentials_exception()
+
+    user_id = payload.get("uid")
+    return email, user_id if isinstance(user_id, int) else None
+
+
+def _cached_principal(email: str, user_id: Optional[int]):
+    """Detached User rebuilt from the principal cache, or None on a miss."""
+    if user_id is None:
+        return None
+
+    data = get_principal(user_id)
+    if data is None or data.get("email") != email or not data.get("is_active"):
+        return None
+    return build_detached_user(data)
+
+
+def _remember_principal(user, email: str):
+    """Drop users whose email no longer matches the token and cache active ones."""
+    if user is None or user.email != email:
+        return None
+    if user.is_active:
+        set_principal(user)
+    return user
+
+
+def _ensure_active(user):
     if user is None:
-        raise credentials_exception
-        
+        raise _credentials_exception()
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user"
         )
-    
     return user
 
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Dependency to get current authenticated user from token.
+    """
+    from app.models.user import User
+
+    email, user_id = _token_subject(token)
+
+    cached_user = _cached_principal(email, user_id)
+    if cached_user is not None:
+        # Attach to the request session without a query so relationships still load.
+        return db.merge(cached_user, load=False)
+
+    if user_id is not None:
+        user = db.get(User, user_id)
+    else:
+        user = db.query(User).filter(User.email == email).first()
+    return _ensure_active(_remember_principal(user, email))
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Same as get_current_user, for endpoints running on the async session.
+    """
+    from app.models.user import User
+
+    email, user_id = _token_subject(token)
+
+    cached_user = _cached_principal(email, user_id)
+    if cached_user is not None:
+        return await db.merge(cached_user, load=False)
+
+    if user_id is not None:
+        user = await db.get(User, user_id)
+    else:
+        user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    return _ensure_active(_remember_principal(user, email))
+
+
+async def authenticate_token_async(token: Optional[str], scope: Optional[str] = None):
+    """
+    Resolve a token (of scope, e.g. STREAM_TICKET_SCOPE) to an active,
+    detached user on a short-lived session.
+
+    Long-lived responses (notification streams) use this instead of
+    get_current_user_async so no pooled connection is held while they run.
+    """
+    from app.models.user import User
+
+    if not token:
+        raise _credentials_exception()
+
+    email, user_id = _token_subject(token, scope)
+
+    cached_user = _cached_principal(email, user_id)
+    if cached_user is not None:
+        return cached_user
+
+    async with AsyncSessionLocal() as db:
+        if user_id is not None:
+            user = await db.get(User, user_id)
+        else:
+            user = (await db.execute(select(User).where(User.email == email))).scalars().first()
+    return _ensure_active(_remember_principal(user, email))
+
+
 def get_current_owner(current_user = Depends(get_current_user)):
     """
     Dependency to ensure current user is an owner or admin.
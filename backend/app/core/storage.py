@@ -12,6 +12,11 @@ def _resolve_uploads_root() -> Path:
     return BACKEND_ROOT / "uploads"
 
 
+def get_uploads_root() -> Path:
+    """Return the uploads root without touching the filesystem."""
+    return _resolve_uploads_root()
+
+
 def ensure_uploads_root() -> Path:
     """Ensure uploads root exists and return it."""
     uploads_root = _resolve_uploads_root()
@@ -0,0 +1,47 @@
+"""
+Helpers for the 30-minute slot grid used by pricing and availability.
+
+Times are stored as "HH:MM" strings; "24:00" is accepted as end of day.
+"""
+
+SLOT_MINUTES = 30
+MINUTES_PER_DAY = 24 * 60
+SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES
+FULL_DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+
+
+def time_to_minutes(value: str) -> int:
+    """Convert "HH:MM" to minutes since midnight."""
+    hours_text, _, minutes_text = str(value).strip().partition(":")
+    hours = int(hours_text)
+    minutes = int(minutes_text or 0)
+    total = hours * 60 + minutes
+    if hours < 0 or not 0 <= minutes < 60 or total > MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time value: {value!r}")
+    return total
+
+
+def minutes_to_time(minutes: int) -> str:
+    """Convert minutes since midnight to "HH:MM"."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def slot_mask(start_minutes: int, end_minutes: int) -> int:
+    """
+    Bit mask of every slot touched by [start_minutes, end_minutes).
+
+    Bit i represents the slot starting at i * SLOT_MINUTES.
+    """
+    start_minutes = max(0, start_minutes)
+    end_minutes = min(MINUTES_PER_DAY, end_minutes)
+    if end_minutes <= start_minutes:
+        return 0
+
+    first_slot = start_minutes // SLOT_MINUTES
+    last_slot = (end_minutes + SLOT_MINUTES - 1) // SLOT_MINUTES
+    return ((1 << (last_slot - first_slot)) - 1) << first_slot
+
+
+def mask_to_hex(mask: int) -> str:
+    """Fixed-width hex encoding of a day mask (12 characters for 48 slots)."""
+    return f"{mask:0{SLOTS_PER_DAY // 4}x}"
@@ -1,8 +1,24 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
+from sqlalchemy import and_, case, event, inspect, or_, func, select
+from sqlalchemy.dialects.postgresql import Range
+from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.core.cache import TTLCache, get_redis_client
+from app.core.catalog_cache import invalidate_court_catalog
+from app.core.config import settings
+from app.core.pricing import get_price_table, invalidate_price_table
+from app.core.timeslots import (
+    FULL_DAY_MASK,
+    SLOT_MINUTES,
+    SLOTS_PER_DAY,
+    mask_to_hex,
+    minutes_to_time,
+    slot_mask,
+    time_to_minutes,
+)
 from app.models.court import Court, IndividualCourt, Booking
 from app.schemas.court import CourtCreate, CourtUpdate, IndividualCourtUpdate, BookingCreate, BookingUpdate
 
@@ -12,6 +28,28 @@ try:
 except ZoneInfoNotFoundError:
     LOCAL_TIMEZONE = ZoneInfo("UTC")
 
+# Booking statuses that keep a slot occupied.
+BLOCKING_BOOKING_STATUSES = ("pending", "active", "confirmed")
+
+# SQLSTATE raised by Postgres when an EXCLUDE constraint rejects a row.
+EXCLUSION_VIOLATION_PGCODE = "23P01"
+
+# Day availability bitmaps keyed by (court_id, date).
+_day_availability_cache = TTLCache(settings.AVAILABILITY_CACHE_TTL_SECONDS, maxsize=2048)
+
+# Per-day booking aggregates of an owner keyed by (owner_id, date), stored with
+# the shared version of that date they were built under.
+_owner_daily_stats_cache = TTLCache(settings.ANALYTICS_CACHE_TTL_SECONDS, maxsize=50000)
+# With REDIS_URL, booking commits bump a per-date counter (and the epoch for an
+# unknown date) so every worker drops its copy; keys are one per calendar date
+# and are never expired, so a counter can never fall back to an older value.
+ANALYTICS_REDIS_EPOCH_KEY = "analytics:epoch"
+ANALYTICS_REDIS_DAY_KEY_PREFIX = "analytics:day:"
+# session.info keys of booking dates / (venue, date) pairs flushed but not yet
+# committed; None stands for an unknown date or venue
+PENDING_ANALYTICS_DATES_KEY = "pending_analytics_dates"
+PENDING_AVAILABILITY_KEY = "pending_availability_days"
+
 
 def normalize_booking_date(booking_date):
     """Convert incoming datetime/date to local calendar date for booking comparisons."""
@@ -26,49 +64,10 @@ def normalize_booking_date(booking_date):
     return booking_date
 
 
-def calculate_multi_tier_price(start_time: str, end_time: str, time_slots: list) -> float:
-    """
-    Calculate price for multi-tier time slots.
-    
-    Iterate through 30-minute intervals and sum up prices for each interval
-    that falls into a time slot tier. This matches the frontend calculation.
-    """
-    if not time_slots:
-        return 0.0
-    
-    start_dt = datetime.strptime(start_time, "%H:%M")
-    end_dt = datetime.strptime(end_time, "%H:%M")
-    
-    total_price = 0.0
-    current_time = start_dt
-    
-    # Iterate through 30-minute intervals (0.5 hour each)
-    while current_time < end_dt:
-        next_time = current_time + timedelta(minutes=30)
-        
-        # Find which time_slot this interval belongs to
-        for slot in time_slots:
-            slot_start_str = slot.get("start_time", "")
-            slot_end_str = slot.get("end_time", "")
-            slot_price = slot.get("price", 0)
-            
-            slot_start = datetime.strptime(slot_start_str, "%H:%M")
-            slot_end = datetime.strptime(slot_end_str, "%H:%M")
-            
-            # Check if current interval starts within this slot
-            if current_time >= slot_start and current_time < slot_end:
-                # Add price for this 30-minute interval (0.5 hour)
-                total_price += slot_price * 0.5
-                break
-        
-        current_time = next_time
-    
-    return total_price
-
 # Court CRUD
 def get_court(db: Session, court_id: int) -> Optional[Court]:
-    """Get a court by ID"""
-    return db.query(Court).filter(Court.id == court_id).first()
+    """Get a court by ID (served from the session identity map when already loaded)"""
+    return db.get(Court, court_id)
 
 
 def get_courts(db: Session, skip: int = 0, limit: int = 100) -> List[Court]:
@@ -76,6 +75,27 @@ def get_courts(db: Session, skip: int = 0, limit: int = 100) -> List[Court]:
     return db.query(Court).offset(skip).limit(limit).all()
 
 
+async def get_court_async(db: AsyncSession, court_id: int) -> Optional[Court]:
+    """Get a court by ID"""
+    return await db.get(Court, court_id)
+
+
+async def get_court_with_details_async(db: AsyncSession, court_id: int) -> Optional[Court]:
+    """Get a court with its individual courts and owner loaded"""
+    result = await db.execute(
+        select(Court)
+        .options(selectinload(Court.individual_courts), selectinload(Court.owner))
+        .where(Court.id == court_id)
+    )
+    return result.scalars().first()
+
+
+async def get_courts_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Court]:
+    """Get all courts"""
+    result = await db.execute(select(Court).offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+
 def get_courts_by_owner(db: Session, owner_id: int) -> List[Court]:
     """Get all courts owned by a specific owner"""
     return db.query(Court).filter(Court.owner_id == owner_id).all()
@@ -116,6 +136,7 @@ def create_court(db: Session, court: CourtCreate, owner_id: int, images: Optiona
     
     db.commit()
     db.refresh(db_court)
+    invalidate_court_catalog()
     
     return db_court
 
@@ -161,6 +182,9 @@ def update_court(db: Session, court_id: int, court_update: CourtUpdate) -> Optio
     
     db.commit()
     db.refresh(db_court)
+    invalidate_price_table(court_id)
+    invalidate_day_availability(court_id)
+    invalidate_court_catalog()
     return db_court
 
 
@@ -172,13 +196,16 @@ def delete_court(db: Session, court_id: int) -> bool:
     
     db.delete(db_court)
     db.commit()
+    invalidate_price_table(court_id)
+    invalidate_day_availability(court_id)
+    invalidate_court_catalog()
     return True
 
 
 # Individual Court CRUD
 def get_individual_court(db: Session, individual_court_id: int) -> Optional[IndividualCourt]:
-    """Get an individual court by ID"""
-    return db.query(IndividualCourt).filter(IndividualCourt.id == individual_court_id).first()
+    """Get an individual court by ID (served from the session identity map when already loaded)"""
+    return db.get(IndividualCourt, individual_court_id)
 
 
 def get_individual_courts_by_court(db: Session, court_id: int) -> List[IndividualCourt]:
@@ -203,6 +230,8 @@ def update_individual_court(db: Session, individual_court_id: int, individual_co
     
     db.commit()
     db.refresh(db_individual_court)
+    invalidate_day_availability(db_individual_court.court_id)
+    invalidate_court_catalog()
     return db_individual_court
 
 
@@ -222,77 +251,371 @@ def get_bookings_by_individual_court(db: Session, individual_court_id: int) -> L
     return db.query(Booking).filter(Booking.individual_court_id == individual_court_id).all()
 
 
+def booking_slot_range(booking_date_only, start_time: str, end_time: str) -> Range:
+    """Build the [start, end) timestamp range stored in Booking.slot_range."""
+    day_start = datetime.combine(booking_date_only, datetime.min.time(), tzinfo=LOCAL_TIMEZONE)
+    return Range(
+        day_start + timedelta(minutes=time_to_minutes(start_time)),
+        day_start + timedelta(minutes=time_to_minutes(end_time)),
+        bounds="[)",
+    )
+
+
+def is_slot_conflict_error(exc: IntegrityError) -> bool:
+    """True when an IntegrityError comes from the ex_bookings_no_overlap constraint."""
+    return getattr(exc.orig, "pgcode", None) == EXCLUSION_VIOLATION_PGCODE
+
+
 def check_booking_overlap(db: Session, individual_court_id: int, booking_date, start_time: str, end_time: str, exclude_booking_id: int = None) -> bool:
     """Check if a booking overlaps with existing bookings"""
     
     # Get the date only (without time)
     booking_date_only = normalize_booking_date(booking_date)
     
-    # Query all blocking bookings for the same court.
-    # Pending/active/confirmed all block the slot.
-    query = db.query(Booking).filter(
+    # Blocking bookings on the same court and date block the slot.
+    # Time overlap if: new_start < existing_end AND new_end > existing_start
+    query = db.query(Booking.id).filter(
         Booking.individual_court_id == individual_court_id,
-        Booking.status.in_(["pending", "active", "confirmed"])
+        _on_booking_date(booking_date_only),
+        _is_blocking_booking(),
+        Booking.start_minute < time_to_minutes(end_time),
+        Booking.end_minute > time_to_minutes(start_time),
     )
     
     # Exclude current booking if updating
     if exclude_booking_id:
         query = query.filter(Booking.id != exclude_booking_id)
     
-    bookings = query.all()
-    
-    # Filter by date (comparing date only)
-    bookings = [b for b in bookings if b.booking_date.date() == booking_date_only]
-    
-    # Check time overlap
-    for existing_booking in bookings:
-        # Time overlap if:
-        # new_start < existing_end AND new_end > existing_start
-        if start_time < existing_booking.end_time and end_time > existing_booking.start_time:
-            return True
-    
-    return False
+    return query.first() is not None
+
+
+def _is_blocking_booking():
+    """
+    A booking holds its slot while either status column is live; the same
+    predicate as the ex_bookings_no_overlap constraint, so the pre-checks and
+    the constraint agree on rows whose two columns disagree.
+    """
+    return or_(
+        Booking.status.in_(BLOCKING_BOOKING_STATUSES),
+        Booking.booking_status.in_(BLOCKING_BOOKING_STATUSES),
+    )
+
+
+def _on_booking_date(booking_date_only):
+    """
+    Match bookings on one calendar date with a half-open range on booking_date.
+
+    Equivalent to func.date(Booking.booking_date) == booking_date_only, but can use
+    the (individual_court_id, booking_date) index.
+    """
+    day_start = datetime.combine(booking_date_only, datetime.min.time())
+    return and_(
+        Booking.booking_date >= day_start,
+        Booking.booking_date < day_start + timedelta(days=1),
+    )
+
+
+def _conflicting_booking_exists(booking_date_only, start_time: str, end_time: str):
+    """EXISTS clause matching a blocking booking on the outer IndividualCourt row."""
+    return (
+        select(Booking.id)
+        .where(
+            Booking.individual_court_id == IndividualCourt.id,
+            _on_booking_date(booking_date_only),
+            Booking.start_minute < time_to_minutes(end_time),
+            Booking.end_minute > time_to_minutes(start_time),
+            _is_blocking_booking(),
+        )
+        .exists()
+    )
 
 
 def find_available_courts(db: Session, court_id: int, booking_date, start_time: str, end_time: str, exclude_court_id: int = None) -> List[IndividualCourt]:
-    """Find all individual courts in the same venue that are available for the given time slot"""
-    
+    """
+    Find all individual courts in the same venue that are available for the given time slot.
+
+    Uses a single anti-join query for the whole venue. Courts are returned in id order,
+    which is the allocation order used by create_booking.
+    """
+
     # Get the date only (without time)
     booking_date_only = normalize_booking_date(booking_date)
-    
-    # Get all individual courts for this venue
-    all_courts = get_individual_courts_by_court(db, court_id)
-    
+
+    query = db.query(IndividualCourt).filter(
+        IndividualCourt.court_id == court_id,
+        IndividualCourt.is_active.is_(True),
+        ~_conflicting_booking_exists(booking_date_only, start_time, end_time),
+    )
+
     # Filter out the excluded court if provided
     if exclude_court_id:
-        all_courts = [c for c in all_courts if c.id != exclude_court_id]
-    
-    available_courts = []
+        query = query.filter(IndividualCourt.id != exclude_court_id)
+
+    return query.order_by(IndividualCourt.id.asc()).all()
+
+
+def get_available_courts(
+    db: Session,
+    booking_date,
+    start_time: str,
+    end_time: str,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[Court]:
+    """
+    Get active venues that have at least one free individual court for the given time slot.
+
+    Operating hours, is_active flags and booking conflicts are all evaluated in SQL,
+    so the whole catalog is filtered in one query before pagination is applied.
+    """
+    return list(db.scalars(_available_courts_statement(booking_date, start_time, end_time, skip, limit)).all())
+
+
+async def get_available_courts_async(
+    db: AsyncSession,
+    booking_date,
+    start_time: str,
+    end_time: str,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[Court]:
+    """Async variant of get_available_courts."""
+    result = await db.execute(_available_courts_statement(booking_date, start_time, end_time, skip, limit))
+    return list(result.scalars().all())
+
+
+def _available_courts_statement(booking_date, start_time: str, end_time: str, skip: int, limit: int):
+    booking_date_only = normalize_booking_date(booking_date)
+
+    has_free_court = (
+        select(IndividualCourt.id)
+        .where(
+            IndividualCourt.court_id == Court.id,
+            IndividualCourt.is_active.is_(True),
+            ~_conflicting_booking_exists(booking_date_only, start_time, end_time),
+        )
+        .exists()
+    )
 
-    for court in all_courts:
-        if not court.is_active:
+    return (
+        select(Court)
+        .where(
+            Court.is_active.is_(True),
+            # Requested range must be inside venue operating hours.
+            Court.opening_minute <= time_to_minutes(start_time),
+            Court.closing_minute >= time_to_minutes(end_time),
+            has_free_court,
+        )
+        .order_by(Court.id.asc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def get_day_availability(db: Session, court_id: int, booking_date) -> dict:
+    """
+    Get a busy-slot bitmap for every individual court of a venue on one date.
+
+    Each bitmap covers the SLOTS_PER_DAY half-hour slots of the day, bit i being
+    the slot that starts at i * SLOT_MINUTES. A set bit means the slot is taken;
+    inactive courts are reported fully busy. Built with one outer join and cached
+    until a committed booking change on that venue and date clears it in this
+    worker; other workers keep their copy for at most AVAILABILITY_CACHE_TTL_SECONDS.
+    """
+    booking_date_only = normalize_booking_date(booking_date)
+    cache_key = (court_id, booking_date_only)
+
+    cached = _day_availability_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    rows = db.execute(_day_availability_statement(court_id, booking_date_only)).all()
+    availability = _build_day_availability(court_id, booking_date_only, rows)
+    _day_availability_cache.set(cache_key, availability)
+    return availability
+
+
+async def get_day_availability_async(db: AsyncSession, court_id: int, booking_date) -> dict:
+    """Async variant of get_day_availability sharing the same cache."""
+    booking_date_only = normalize_booking_date(booking_date)
+    cache_key = (court_id, booking_date_only)
+
+    cached = _day_availability_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    rows = (await db.execute(_day_availability_statement(court_id, booking_date_only))).all()
+    availability = _build_day_availability(court_id, booking_date_only, rows)
+    _day_availability_cache.set(cache_key, availability)
+    return availability
+
+
+def _day_availability_statement(court_id: int, booking_date_only):
+    return (
+        select(
+            IndividualCourt.id,
+            IndividualCourt.name,
+            IndividualCourt.is_active,
+            Booking.start_minute,
+            Booking.end_minute,
+        )
+        .outerjoin(
+            Booking,
+            and_(
+                Booking.individual_court_id == IndividualCourt.id,
+                _on_booking_date(booking_date_only),
+                _is_blocking_booking(),
+            ),
+        )
+        .where(IndividualCourt.court_id == court_id)
+        .order_by(IndividualCourt.id.asc())
+    )
+
+
+def _build_day_availability(court_id: int, booking_date_only, rows) -> dict:
+    courts = {}
+    for row in rows:
+        entry = courts.get(row.id)
+        if entry is None:
+            entry = courts[row.id] = {
+                "id": row.id,
+                "name": row.name,
+                "is_active": bool(row.is_active),
+                "mask": 0 if row.is_active else FULL_DAY_MASK,
+            }
+
+        if row.start_minute is None or row.end_minute is None:
             continue
 
-        conflict_query = db.query(Booking).filter(
-            Booking.individual_court_id == court.id,
-            func.date(Booking.booking_date) == booking_date_only,
-            Booking.start_time < end_time,
-            Booking.end_time > start_time,
-            or_(
-                Booking.status.in_(["pending", "active", "confirmed"]),
-                Booking.booking_status.in_(["pending", "active", "confirmed"]),
+        entry["mask"] |= slot_mask(row.start_minute, row.end_minute)
+
+    return {
+        "court_id": court_id,
+        "booking_date": booking_date_only,
+        "slot_minutes": SLOT_MINUTES,
+        "slots_per_day": SLOTS_PER_DAY,
+        "individual_courts": [
+            {
+                "id": entry["id"],
+                "name": entry["name"],
+                "is_active": entry["is_active"],
+                "busy_slots": mask_to_hex(entry["mask"]),
+            }
+            for entry in courts.values()
+        ],
+    }
+
+
+def invalidate_day_availability(court_id: int, booking_date=None) -> None:
+    """Drop cached availability for a venue, for one date or for every date."""
+    if booking_date is not None:
+        _day_availability_cache.delete((court_id, normalize_booking_date(booking_date)))
+        return
+
+    _day_availability_cache.delete_matching(lambda key: key[0] == court_id)
+
+
+def find_free_windows(
+    db: Session,
+    court: Court,
+    start_date,
+    end_date,
+    duration_minutes: int,
+    limit: int = 20,
+) -> List[dict]:
+    """
+    Find bookable windows of duration_minutes at a venue between two dates, cheapest first.
+
+    Occupancy for every individual court and day in the range is loaded with one
+    query and reduced to slot bitmaps. A window is free when at least one active
+    court has none of its slots set; candidates are then priced from the venue's
+    compiled PriceTable and ranked by (price, date, start time).
+    """
+    start_day = normalize_booking_date(start_date)
+    end_day = normalize_booking_date(end_date)
+    range_start = datetime.combine(start_day, datetime.min.time())
+    range_end = datetime.combine(end_day, datetime.min.time()) + timedelta(days=1)
+
+    rows = (
+        db.query(
+            IndividualCourt.id,
+            func.date(Booking.booking_date).label("booking_day"),
+            Booking.start_minute,
+            Booking.end_minute,
+        )
+        .outerjoin(
+            Booking,
+            and_(
+                Booking.individual_court_id == IndividualCourt.id,
+                Booking.booking_date >= range_start,
+                Booking.booking_date < range_end,
+                _is_blocking_booking(),
             ),
         )
+        .filter(
+            IndividualCourt.court_id == court.id,
+            IndividualCourt.is_active.is_(True),
+        )
+        .all()
+    )
 
-        if not conflict_query.first():
-            available_courts.append(court)
-    
-    return available_courts
+    court_ids = sorted({row.id for row in rows})
+    if not court_ids or court.opening_minute is None or court.closing_minute is None:
+        return []
+
+    # occupancy[day][court_id] -> busy slot bitmap
+    occupancy: dict = {}
+    for row in rows:
+        if row.booking_day is None or row.start_minute is None or row.end_minute is None:
+            continue
+        day_masks = occupancy.setdefault(row.booking_day, {})
+        day_masks[row.id] = day_masks.get(row.id, 0) | slot_mask(row.start_minute, row.end_minute)
+
+    # Candidate starts on the slot grid that keep the window inside operating hours.
+    first_start = -(-court.opening_minute // SLOT_MINUTES) * SLOT_MINUTES
+    candidate_starts = list(range(first_start, court.closing_minute - duration_minutes + 1, SLOT_MINUTES))
+    if not candidate_starts:
+        return []
+
+    price_table = get_price_table(court)
+    window_masks = [slot_mask(start, start + duration_minutes) for start in candidate_starts]
+    window_prices = price_table.price_many(
+        (start, start + duration_minutes) for start in candidate_starts
+    )
+
+    now_local = datetime.now(LOCAL_TIMEZONE)
+    now_minutes = now_local.hour * 60 + now_local.minute
+
+    windows = []
+    current_day = start_day
+    while current_day <= end_day:
+        day_masks = occupancy.get(current_day, {})
+        court_masks = [day_masks.get(court_id, 0) for court_id in court_ids]
+
+        for start, window_mask, price in zip(candidate_starts, window_masks, window_prices):
+            if current_day == now_local.date() and start <= now_minutes:
+                continue
+
+            free_court_count = sum(1 for mask in court_masks if not mask & window_mask)
+            if free_court_count:
+                windows.append(
+                    {
+                        "booking_date": current_day,
+                        "start_time": minutes_to_time(start),
+                        "end_time": minutes_to_time(start + duration_minutes),
+                        "price": price,
+                        "free_court_count": free_court_count,
+                    }
+                )
+
+        current_day += timedelta(days=1)
+
+    windows.sort(key=lambda item: (item["price"], item["booking_date"], item["start_time"]))
+    return windows[:limit]
 
 
 def create_booking(db: Session, booking: BookingCreate, user_id: int) -> Booking:
     """Create a new booking with payment info"""
-    from datetime import datetime as dt
     from app.models.court import PaymentMethod, PaymentStatus, BookingStatus
     from app.core.vietqr_service import VietQRService
     from app.crud.user import get_user_by_id
@@ -317,43 +640,58 @@ def create_booking(db: Session, booking: BookingCreate, user_id: int) -> Booking
 
     if not available_courts:
         raise ValueError("Tất cả sân đã có lịch đặt trong khung giờ này. Vui lòng chọn khung giờ khác.")
-
-    allocated_court = available_courts[0]
     
     # Calculate price using multi-tier pricing (same as payment preview endpoint)
-    total_price = calculate_multi_tier_price(
-        booking.start_time,
-        booking.end_time,
-        parent_court.time_slots or []
+    total_price = get_price_table(parent_court).price(
+        time_to_minutes(booking.start_time),
+        time_to_minutes(booking.end_time),
     )
     
     # Calculate total hours
-    start_dt = dt.strptime(booking.start_time, "%H:%M")
-    end_dt = dt.strptime(booking.end_time, "%H:%M")
-    total_hours = (end_dt - start_dt).seconds / 3600
+    total_hours = (time_to_minutes(booking.end_time) - time_to_minutes(booking.start_time)) / 60
     
     booking_date_only = normalize_booking_date(booking.booking_date)
     booking_datetime = datetime.combine(booking_date_only, datetime.min.time())
+    slot_range = booking_slot_range(booking_date_only, booking.start_time, booking.end_time)
 
-    # Create booking
-    db_booking = Booking(
-        individual_court_id=allocated_court.id,
-        user_id=user_id,
-        booking_date=booking_datetime,
-        start_time=booking.start_time,
-        end_time=booking.end_time,
-        phone_number=booking.phone_number,
-        customer_name=booking.customer_name,
-        customer_email=booking.customer_email,
-        total_hours=total_hours,
-        total_price=total_price,
-        payment_method=PaymentMethod.vietqr if booking.payment_method == "vietqr" else PaymentMethod.cash,
-        payment_status=PaymentStatus.pending,
-        booking_status=BookingStatus.pending,
-        status="pending"  # Legacy field
-    )
+    # Allocate from the first available individual court to the last. The
+    # ex_bookings_no_overlap constraint is the source of truth: if a concurrent
+    # request took the court in the meantime, fall through to the next one.
+    db_booking = None
+    for candidate_court in available_courts:
+        candidate_booking = Booking(
+            individual_court_id=candidate_court.id,
+            user_id=user_id,
+            booking_date=booking_datetime,
+            start_time=booking.start_time,
+            end_time=booking.end_time,
+            slot_range=slot_range,
+            phone_number=booking.phone_number,
+            customer_name=booking.customer_name,
+            customer_email=booking.customer_email,
+            total_hours=total_hours,
+            total_price=total_price,
+            payment_method=PaymentMethod.vietqr if booking.payment_method == "vietqr" else PaymentMethod.cash,
+            payment_status=PaymentStatus.pending,
+            booking_status=BookingStatus.pending,
+            status="pending"  # Legacy field
+        )
+
+        try:
+            with db.begin_nested():
+                db.add(candidate_booking)
+        except IntegrityError as exc:
+            if not is_slot_conflict_error(exc):
+                raise
+            continue
+
+        db_booking = candidate_booking
+        break
+
+    if db_booking is None:
+        db.rollback()
+        raise ValueError("Tất cả sân đã có lịch đặt trong khung giờ này. Vui lòng chọn khung giờ khác.")
     
-    db.add(db_booking)
     db.commit()
     db.refresh(db_booking)
     
@@ -422,8 +760,21 @@ def update_booking(db: Session, booking_id: int, booking_update: BookingUpdate)
     
     for field, value in update_data.items():
         setattr(db_booking, field, value)
+
+    if any(key in update_data for key in ['booking_date', 'start_time', 'end_time']):
+        db_booking.slot_range = booking_slot_range(
+            normalize_booking_date(db_booking.booking_date),
+            db_booking.start_time,
+            db_booking.end_time,
+        )
     
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as exc:
+        db.rollback()
+        if is_slot_conflict_error(exc):
+            raise ValueError("Sân đã được đặt trong khung giờ này. Vui lòng chọn khung giờ khác.")
+        raise
     db.refresh(db_booking)
     return db_booking
 
@@ -433,33 +784,23 @@ def delete_booking(db: Session, booking_id: int) -> bool:
     db_booking = get_booking(db, booking_id)
     if not db_booking:
         return False
-    
+
     db.delete(db_booking)
     db.commit()
     return True
 
 
-def get_bookings_by_owner(
-    db: Session, 
+def _owner_bookings_query(
+    db: Session,
     owner_id: int,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     court_id: Optional[int] = None,
     individual_court_id: Optional[int] = None,
-    status: Optional[str] = None
-) -> List[Booking]:
-    """
-    Get all bookings for courts owned by a specific owner with optional filters
-    
-    Args:
-        owner_id: The owner's user ID
-        start_date: Filter bookings from this date onwards
-        end_date: Filter bookings up to this date
-        court_id: Filter by specific court complex
-        individual_court_id: Filter by specific individual court
-        status: Filter by booking status (active, completed, cancelled)
-    """
-    # Start with base query joining through individual_court and court
+    status: Optional[str] = None,
+    after: Optional[tuple] = None,
+):
+    """Base query of an owner's bookings joined to IndividualCourt and Court, with filters applied."""
     query = db.query(Booking).join(
         IndividualCourt, Booking.individual_court_id == IndividualCourt.id
     ).join(
@@ -467,26 +808,132 @@ def get_bookings_by_owner(
     ).filter(
         Court.owner_id == owner_id
     )
-    
-    # Apply filters
+
     if start_date:
         query = query.filter(Booking.booking_date >= start_date)
-    
+
     if end_date:
         query = query.filter(Booking.booking_date <= end_date)
-    
+
     if court_id:
         query = query.filter(Court.id == court_id)
-    
+
     if individual_court_id:
         query = query.filter(Booking.individual_court_id == individual_court_id)
-    
+
     if status:
         query = query.filter(Booking.status == status)
+
+    # Keyset position for ORDER BY booking_date DESC, start_time ASC, id ASC.
+    if after:
+        after_date, after_start_time, after_id = after
+        query = query.filter(
+            or_(
+                Booking.booking_date < after_date,
+                and_(
+                    Booking.booking_date == after_date,
+                    or_(
+                        Booking.start_time > after_start_time,
+                        and_(Booking.start_time == after_start_time, Booking.id > after_id),
+                    ),
+                ),
+            )
+        )
+
+    return query.order_by(Booking.booking_date.desc(), Booking.start_time, Booking.id)
+
+
+def get_bookings_by_owner(
+    db: Session, 
+    owner_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    court_id: Optional[int] = None,
+    individual_court_id: Optional[int] = None,
+    status: Optional[str] = None,
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None,
+) -> List[Booking]:
+    """
+    Get all bookings for courts owned by a specific owner with optional filters
     
-    # Order by booking date and start time
-    query = query.order_by(Booking.booking_date.desc(), Booking.start_time)
-    
+    Args:
+        owner_id: The owner's user ID
+        start_date: Filter bookings from this date onwards
+        end_date: Filter bookings up to this date
+        court_id: Filter by specific court complex
+        individual_court_id: Filter by specific individual court
+        status: Filter by booking status (active, completed, cancelled)
+        after: (booking_date, start_time, id) of the last booking of the previous page
+        limit: Maximum number of bookings to return
+
+    individual_court, its court and the booking user are loaded in the same
+    query, so serializing the result does not issue further queries.
+    """
+    query = _owner_bookings_query(
+        db,
+        owner_id,
+        start_date=start_date,
+        end_date=end_date,
+        court_id=court_id,
+        individual_court_id=individual_court_id,
+        status=status,
+        after=after,
+    ).options(
+        contains_eager(Booking.individual_court).contains_eager(IndividualCourt.court),
+        joinedload(Booking.user),
+    )
+
+    if limit:
+        query = query.limit(limit)
+
+    return query.all()
+
+
+def get_owner_booking_rows(
+    db: Session,
+    owner_id: int,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    court_id: Optional[int] = None,
+    individual_court_id: Optional[int] = None,
+    status: Optional[str] = None,
+    after: Optional[tuple] = None,
+    limit: Optional[int] = None,
+) -> list:
+    """
+    Same filters and ordering as get_bookings_by_owner, but only the columns the
+    owner schedule grid needs, selected as plain rows instead of ORM objects.
+    """
+    query = _owner_bookings_query(
+        db,
+        owner_id,
+        start_date=start_date,
+        end_date=end_date,
+        court_id=court_id,
+        individual_court_id=individual_court_id,
+        status=status,
+        after=after,
+    ).with_entities(
+        Booking.id,
+        Booking.booking_date,
+        Booking.start_time,
+        Booking.end_time,
+        Booking.individual_court_id,
+        IndividualCourt.name.label("individual_court_name"),
+        Court.id.label("court_id"),
+        Court.name.label("court_name"),
+        Booking.customer_name,
+        Booking.phone_number,
+        Booking.status,
+        Booking.booking_status,
+        Booking.payment_status,
+        Booking.total_price,
+    )
+
+    if limit:
+        query = query.limit(limit)
+
     return query.all()
 
 
@@ -497,29 +944,360 @@ def get_owner_bookings_summary(db: Session, owner_id: int) -> dict:
     
     today = datetime.now().date()
     thirty_days_ago = today - timedelta(days=30)
-    
-    # Get all bookings in last 30 days
-    bookings = get_bookings_by_owner(
-        db, 
-        owner_id,
-        start_date=datetime.combine(thirty_days_ago, datetime.min.time()),
-        end_date=datetime.combine(today, datetime.max.time())
+
+    # Count bookings of the last 30 days per legacy status in the database.
+    status_counts = dict(
+        db.query(Booking.status, func.count(Booking.id))
+        .join(IndividualCourt, Booking.individual_court_id == IndividualCourt.id)
+        .join(Court, IndividualCourt.court_id == Court.id)
+        .filter(
+            Court.owner_id == owner_id,
+            Booking.booking_date >= datetime.combine(thirty_days_ago, datetime.min.time()),
+            Booking.booking_date <= datetime.combine(today, datetime.max.time()),
+        )
+        .group_by(Booking.status)
+        .all()
     )
     
-    total_bookings = len(bookings)
-    active_bookings = len([b for b in bookings if b.status == 'active'])
-    completed_bookings = len([b for b in bookings if b.status == 'completed'])
-    cancelled_bookings = len([b for b in bookings if b.status == 'cancelled'])
-    
     return {
-        "total_bookings": total_bookings,
-        "active_bookings": active_bookings,
-        "completed_bookings": completed_bookings,
-        "cancelled_bookings": cancelled_bookings,
+        "total_bookings": sum(status_counts.values()),
+        "active_bookings": status_counts.get("active", 0),
+        "completed_bookings": status_counts.get("completed", 0),
+        "cancelled_bookings": status_counts.get("cancelled", 0),
         "period_days": 30
     }
 
 
+def _revenue_booking_condition():
+    """SQL condition for bookings that count as revenue, matching the owner revenue page."""
+    from app.models.court import BookingStatus, PaymentStatus
+
+    return and_(
+        Booking.booking_status != BookingStatus.cancelled,
+        Booking.payment_status != PaymentStatus.failed,
+        or_(
+            Booking.payment_status == PaymentStatus.paid,
+            Booking.booking_status.in_(
+                [BookingStatus.confirmed, BookingStatus.active, BookingStatus.completed]
+            ),
+        ),
+    )
+
+
+def _load_owner_daily_stats(db: Session, owner_id: int, first_day, last_day, versions: dict) -> dict:
+    """
+    Aggregate an owner's bookings per day and individual court in SQL, cache
+    each day under its shared version and return the stats per day.
+    """
+    from app.models.court import BookingStatus
+
+    is_revenue = _revenue_booking_condition()
+    booking_day = func.date(Booking.booking_date).label("booking_day")
+
+    rows = (
+        db.query(
+            booking_day,
+            Booking.individual_court_id,
+            func.coalesce(func.sum(case((is_revenue, Booking.total_price), else_=0)), 0).label("revenue"),
+            func.coalesce(
+                func.sum(case((is_revenue, Booking.end_minute - Booking.start_minute), else_=0)), 0
+            ).label("minutes_sold"),
+            func.count(case((is_revenue, Booking.id))).label("revenue_bookings"),
+            func.count(Booking.id).label("total_bookings"),
+            func.count(case((Booking.booking_status == BookingStatus.cancelled, Booking.id))).label("cancelled_bookings"),
+        )
+        .join(IndividualCourt, Booking.individual_court_id == IndividualCourt.id)
+        .join(Court, IndividualCourt.court_id == Court.id)
+        .filter(
+            Court.owner_id == owner_id,
+            Booking.booking_date >= datetime.combine(first_day, datetime.min.time()),
+            Booking.booking_date < datetime.combine(last_day, datetime.min.time()) + timedelta(days=1),
+        )
+        .group_by(booking_day, Booking.individual_court_id)
+        .all()
+    )
+
+    daily_stats: dict = {}
+    for row in rows:
+        daily_stats.setdefault(row.booking_day, []).append(
+            {
+                "individual_court_id": row.individual_court_id,
+                "revenue": float(row.revenue or 0),
+                "minutes_sold": int(row.minutes_sold or 0),
+                "revenue_bookings": row.revenue_bookings,
+                "total_bookings": row.total_bookings,
+                "cancelled_bookings": row.cancelled_bookings,
+            }
+        )
+
+    loaded = {}
+    day = first_day
+    while day <= last_day:
+        loaded[day] = tuple(daily_stats.get(day, ()))
+        _owner_daily_stats_cache.set((owner_id, day), (versions.get(day), loaded[day]))
+        day += timedelta(days=1)
+    return loaded
+
+
+def _analytics_period_start(day, granularity: str):
+    """First day of the day/week/month bucket containing day (weeks start on Monday, as date_trunc)."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def get_owner_analytics(
+    db: Session,
+    owner_id: int,
+    start_date,
+    end_date,
+    granularity: str = "day",
+    group_by: str = "venue",
+    court_id: Optional[int] = None,
+) -> dict:
+    """
+    Revenue, hours sold and occupancy of an owner's courts per day/week/month.
+
+    Bookings are aggregated per day and individual court with SQL GROUP BY and
+    cached per (owner, day); committed booking writes drop only the days they
+    touch, so a refresh re-aggregates just those days. With REDIS_URL the drop
+    reaches every worker at once; without it other workers may serve a day up
+    to ANALYTICS_CACHE_TTL_SECONDS stale. Buckets are rolled up from the daily
+    aggregates and occupancy is hours sold over opening hours of active courts.
+    """
+    first_day = normalize_booking_date(start_date)
+    last_day = normalize_booking_date(end_date)
+
+    court_rows = (
+        db.query(
+            IndividualCourt.id.label("individual_court_id"),
+            IndividualCourt.name.label("individual_court_name"),
+            IndividualCourt.is_active,
+            Court.id.label("court_id"),
+            Court.name.label("court_name"),
+            Court.opening_minute,
+            Court.closing_minute,
+        )
+        .join(Court, IndividualCourt.court_id == Court.id)
+        .filter(Court.owner_id == owner_id)
+        .order_by(Court.id, IndividualCourt.id)
+        .all()
+    )
+    if court_id is not None:
+        court_rows = [row for row in court_rows if row.court_id == court_id]
+    courts_by_individual_id = {row.individual_court_id: row for row in court_rows}
+
+    days = []
+    day = first_day
+    while day <= last_day:
+        days.append(day)
+        day += timedelta(days=1)
+
+    versions = _shared_analytics_versions(days)
+    daily_stats = {}
+    for day in days:
+        entry = _owner_daily_stats_cache.get((owner_id, day))
+        if entry is not None and entry[0] == versions[day]:
+            daily_stats[day] = entry[1]
+    missing_days = [day for day in days if day not in daily_stats]
+    if missing_days:
+        loaded = _load_owner_daily_stats(db, owner_id, missing_days[0], missing_days[-1], versions)
+        for day in missing_days:
+            daily_stats[day] = loaded[day]
+
+    def group_key(row):
+        if group_by == "individual_court":
+            return row.court_id, row.individual_court_id
+        return row.court_id, None
+
+    buckets: dict = {}
+
+    def bucket_for(period_start, row):
+        key = (period_start,) + group_key(row)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = {
+                "period_start": period_start,
+                "court_id": row.court_id,
+                "court_name": row.court_name,
+                "individual_court_id": row.individual_court_id if group_by == "individual_court" else None,
+                "individual_court_name": row.individual_court_name if group_by == "individual_court" else None,
+                "revenue": 0.0,
+                "minutes_sold": 0,
+                "capacity_minutes": 0,
+                "revenue_bookings": 0,
+                "total_bookings": 0,
+                "cancelled_bookings": 0,
+            }
+            buckets[key] = bucket
+        return bucket
+
+    for day in days:
+        period_start = _analytics_period_start(day, granularity)
+
+        for row in court_rows:
+            bucket = bucket_for(period_start, row)
+            if row.is_active and row.opening_minute is not None and row.closing_minute is not None:
+                bucket["capacity_minutes"] += max(0, row.closing_minute - row.opening_minute)
+
+        for stats in daily_stats[day]:
+            row = courts_by_individual_id.get(stats["individual_court_id"])
+            if row is None:
+                continue
+            bucket = bucket_for(period_start, row)
+            bucket["revenue"] += stats["revenue"]
+            bucket["minutes_sold"] += stats["minutes_sold"]
+            bucket["revenue_bookings"] += stats["revenue_bookings"]
+            bucket["total_bookings"] += stats["total_bookings"]
+            bucket["cancelled_bookings"] += stats["cancelled_bookings"]
+
+    def summarize(values: dict) -> dict:
+        minutes_sold = values.pop("minutes_sold")
+        capacity_minutes = values.pop("capacity_minutes")
+        values["hours_sold"] = minutes_sold / 60
+        values["capacity_hours"] = capacity_minutes / 60
+        values["occupancy_rate"] = minutes_sold / capacity_minutes if capacity_minutes else 0.0
+        return values
+
+    totals = {
+        "revenue": 0.0,
+        "minutes_sold": 0,
+        "capacity_minutes": 0,
+        "revenue_bookings": 0,
+        "total_bookings": 0,
+        "cancelled_bookings": 0,
+    }
+    for bucket in buckets.values():
+        for field in totals:
+            totals[field] += bucket[field]
+
+    ordered_buckets = [
+        summarize(buckets[key])
+        for key in sorted(buckets, key=lambda key: (key[0], key[1], key[2] or 0))
+    ]
+
+    return {
+        "start_date": first_day,
+        "end_date": last_day,
+        "granularity": granularity,
+        "group_by": group_by,
+        "totals": summarize(totals),
+        "buckets": ordered_buckets,
+    }
+
+
+def invalidate_owner_analytics(owner_id: Optional[int] = None, booking_date=None) -> None:
+    """Drop cached daily aggregates for one owner and/or one date."""
+    booking_day = normalize_booking_date(booking_date) if booking_date is not None else None
+    _owner_daily_stats_cache.delete_matching(
+        lambda key: (owner_id is None or key[0] == owner_id)
+        and (booking_day is None or key[1] == booking_day)
+    )
+
+
+def _shared_analytics_versions(days: list) -> dict:
+    """Shared version of each day, or None per day without a readable Redis."""
+    client = get_redis_client()
+    if client is None or not days:
+        return {day: None for day in days}
+    keys = [ANALYTICS_REDIS_EPOCH_KEY] + [f"{ANALYTICS_REDIS_DAY_KEY_PREFIX}{day.isoformat()}" for day in days]
+    try:
+        values = client.mget(keys)
+    except Exception:
+        return {day: None for day in days}
+    epoch = int(values[0] or 0)
+    return {day: (epoch, int(value or 0)) for day, value in zip(days, values[1:])}
+
+
+def _publish_analytics_invalidation(booking_dates: set) -> None:
+    """Tell the other workers which days' aggregates are stale (None: every day)."""
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        pipeline = client.pipeline(transaction=False)
+        if None in booking_dates:
+            pipeline.incr(ANALYTICS_REDIS_EPOCH_KEY)
+        else:
+            for booking_date in booking_dates:
+                pipeline.incr(f"{ANALYTICS_REDIS_DAY_KEY_PREFIX}{booking_date.isoformat()}")
+        pipeline.execute()
+    except Exception:
+        pass
+
+
+def _history_values(state, attribute: str) -> list:
+    """Old, new and unchanged non-null values of an attribute in this flush."""
+    history = state.attrs[attribute].history
+    return [
+        value
+        for value in list(history.added or ()) + list(history.deleted or ()) + list(history.unchanged or ())
+        if value is not None
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_booking_changes_on_flush(session, flush_context) -> None:
+    """
+    Remember the dates and (venue, date) pairs a flushed booking was or is on;
+    the cached analytics aggregates and availability bitmaps for them are
+    dropped once the transaction commits.
+
+    Bookings are written from several modules (CRUD, payment endpoints, webhooks),
+    so the caches listen for flushed Booking rows instead of relying on each writer.
+    Clearing at flush time would let a concurrent read re-cache the old committed
+    data before the commit lands.
+    """
+    touched_dates = session.info.setdefault(PENDING_ANALYTICS_DATES_KEY, set())
+    touched_venue_days = session.info.setdefault(PENDING_AVAILABILITY_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, Booking):
+            continue
+
+        state = inspect(obj)
+        # None marks an unknown value (expired and not reloaded): clear more broadly.
+        booking_dates = {normalize_booking_date(value) for value in _history_values(state, "booking_date")} or {None}
+        venue_ids = set()
+        for individual_court_id in _history_values(state, "individual_court_id"):
+            individual_court = session.get(IndividualCourt, individual_court_id)
+            if individual_court is not None:
+                venue_ids.add(individual_court.court_id)
+
+        touched_dates.update(booking_dates)
+        if not venue_ids:
+            touched_venue_days.add((None, None))
+            continue
+        touched_venue_days.update((venue_id, booking_date) for venue_id in venue_ids for booking_date in booking_dates)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_booking_caches_on_commit(session) -> None:
+    touched_dates = session.info.pop(PENDING_ANALYTICS_DATES_KEY, None)
+    if touched_dates:
+        _publish_analytics_invalidation(touched_dates)
+        if None in touched_dates:
+            invalidate_owner_analytics()
+        else:
+            for booking_date in touched_dates:
+                invalidate_owner_analytics(booking_date=booking_date)
+
+    touched_venue_days = session.info.pop(PENDING_AVAILABILITY_KEY, None)
+    if touched_venue_days:
+        if (None, None) in touched_venue_days:
+            _day_availability_cache.clear()
+        else:
+            for venue_id, booking_date in touched_venue_days:
+                invalidate_day_availability(venue_id, booking_date)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_rolled_back_booking_changes(session) -> None:
+    session.info.pop(PENDING_ANALYTICS_DATES_KEY, None)
+    session.info.pop(PENDING_AVAILABILITY_KEY, None)
+
+
 # Payment CRUD
 async def auto_verify_booking_payment(db: Session, booking_id: int) -> Optional[Booking]:
     """
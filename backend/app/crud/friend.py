@@ -8,7 +8,7 @@ from app.models.friend import FriendRequest, Friendship
 from app.models.user import User
 from app.models.notification import Notification
 from app.schemas.notification import NotificationCreate
-from app.crud.notification import create_notification
+from app.crud.notification import create_notification, create_notifications
 
 
 STREAK_WARNING_TYPE = "friend_streak_warning"
@@ -75,49 +75,58 @@ def touch_friendship_invite_activity(
     return friendship
 
 
-def _create_streak_warning_notifications(
+def _streak_warning_notifications(
     db: Session,
     friendship: Friendship,
     warning_anchor: datetime,
-):
-    user_low = db.query(User).filter(User.id == friendship.user_low_id).first()
-    user_high = db.query(User).filter(User.id == friendship.user_high_id).first()
+) -> List[NotificationCreate]:
+    """Day-5 warnings still owed to each side of a friendship since warning_anchor."""
+    pair_ids = (friendship.user_low_id, friendship.user_high_id)
+    users = {user.id: user for user in db.query(User).filter(User.id.in_(pair_ids)).all()}
+    user_low = users.get(friendship.user_low_id)
+    user_high = users.get(friendship.user_high_id)
     if not user_low or not user_high:
-        return
+        return []
+
+    already_warned = {
+        row.user_id
+        for row in db.query(Notification.user_id).filter(
+            Notification.user_id.in_(pair_ids),
+            Notification.type == STREAK_WARNING_TYPE,
+            Notification.related_id == friendship.id,
+            Notification.created_at >= warning_anchor,
+        )
+    }
 
     pairs = [
         (user_low.id, user_high.full_name),
         (user_high.id, user_low.full_name),
     ]
-
-    for recipient_id, friend_name in pairs:
-        exists = (
-            db.query(Notification)
-            .filter(
-                Notification.user_id == recipient_id,
-                Notification.type == STREAK_WARNING_TYPE,
-                Notification.related_id == friendship.id,
-                Notification.created_at >= warning_anchor,
-            )
-            .first()
-        )
-        if exists:
-            continue
-
-        create_notification(
-            db,
-            NotificationCreate(
-                user_id=recipient_id,
-                title="Streak ending soon",
-                message=f"Your streak with {friend_name} is about to end. Create an invite now to keep it alive.",
-                type=STREAK_WARNING_TYPE,
-                related_id=friendship.id,
-            ),
+    return [
+        NotificationCreate(
+            user_id=recipient_id,
+            title="Streak ending soon",
+            message=f"Your streak with {friend_name} is about to end. Create an invite now to keep it alive.",
+            type=STREAK_WARNING_TYPE,
+            related_id=friendship.id,
         )
+        for recipient_id, friend_name in pairs
+        if recipient_id not in already_warned
+    ]
 
 
-def refresh_friendship_streak_state(db: Session, friendship: Friendship) -> bool:
-    """Apply streak expiry rules and trigger day-5 warning notifications."""
+def refresh_friendship_streak_state(
+    db: Session,
+    friendship: Friendship,
+    pending_warnings: Optional[List[NotificationCreate]] = None,
+) -> bool:
+    """
+    Apply streak expiry rules and trigger day-5 warning notifications.
+
+    When pending_warnings is given, warnings are appended to it for the caller
+    to create in one batch with create_notifications(); otherwise they are
+    created (and committed) right away.
+    """
     now_utc = datetime.utcnow()
     has_changes = _apply_streak_expiry(friendship, now_utc)
 
@@ -128,7 +137,11 @@ def refresh_friendship_streak_state(db: Session, friendship: Friendship) -> bool
 
     elapsed = now_utc - last_activity
     if timedelta(days=STREAK_WARNING_DAYS) <= elapsed < timedelta(days=STREAK_EXPIRY_DAYS):
-        _create_streak_warning_notifications(db, friendship, last_activity_raw or now_utc)
+        warnings = _streak_warning_notifications(db, friendship, last_activity_raw or now_utc)
+        if pending_warnings is not None:
+            pending_warnings.extend(warnings)
+        else:
+            create_notifications(db, warnings)
 
     return has_changes
 
@@ -0,0 +1,97 @@
+"""
+Request-scoped loaders for primary-key lookups.
+
+Booking endpoints resolve booking -> individual court -> court -> owner/user
+several times per request. A loader memoizes every id it has resolved for the
+lifetime of the Session (one Session per request via get_db), and ids queued
+with prime()/load_many() are fetched together in a single IN query.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.court import Court, IndividualCourt
+from app.models.user import User
+
+
+class PrimaryKeyLoader:
+    """Memoizing, batching loader for one model keyed by its `id` column."""
+
+    def __init__(self, db: Session, model):
+        self._db = db
+        self._model = model
+        self._loaded: Dict[int, object] = {}
+        self._pending = set()
+
+    def prime(self, ids: Iterable[Optional[int]]) -> None:
+        """Queue ids to be fetched together with the next load."""
+        for item_id in ids:
+            if item_id is not None and item_id not in self._loaded:
+                self._pending.add(item_id)
+
+    def load(self, item_id: Optional[int]):
+        if item_id is None:
+            return None
+        if item_id not in self._loaded:
+            self._pending.add(item_id)
+            self._dispatch()
+        return self._loaded[item_id]
+
+    def load_many(self, ids: Iterable[Optional[int]]) -> List:
+        ids = list(ids)
+        self.prime(ids)
+        self._dispatch()
+        return [self._loaded.get(item_id) if item_id is not None else None for item_id in ids]
+
+    def _dispatch(self) -> None:
+        if not self._pending:
+            return
+
+        ids, self._pending = self._pending, set()
+        rows = self._db.query(self._model).filter(self._model.id.in_(ids)).all()
+        # Misses are memoized too so a missing row is not queried again.
+        for item_id in ids:
+            self._loaded[item_id] = None
+        for row in rows:
+            self._loaded[row.id] = row
+
+
+class RequestLoaders:
+    def __init__(self, db: Session):
+        self.users = PrimaryKeyLoader(db, User)
+        self.courts = PrimaryKeyLoader(db, Court)
+        self.individual_courts = PrimaryKeyLoader(db, IndividualCourt)
+
+
+def get_loaders(db: Session) -> RequestLoaders:
+    """Loaders bound to this Session, created on first use."""
+    loaders = db.info.get("loaders")
+    if loaders is None:
+        loaders = db.info["loaders"] = RequestLoaders(db)
+    return loaders
+
+
+def load_user(db: Session, user_id: Optional[int]) -> Optional[User]:
+    return get_loaders(db).users.load(user_id)
+
+
+def load_court(db: Session, court_id: Optional[int]) -> Optional[Court]:
+    return get_loaders(db).courts.load(court_id)
+
+
+def load_individual_court(db: Session, individual_court_id: Optional[int]) -> Optional[IndividualCourt]:
+    return get_loaders(db).individual_courts.load(individual_court_id)
+
+
+def load_booking_venue(db: Session, booking) -> Tuple[Optional[IndividualCourt], Optional[Court]]:
+    """Individual court and parent court of a booking."""
+    individual_court = load_individual_court(db, booking.individual_court_id)
+    parent_court = load_court(db, individual_court.court_id) if individual_court else None
+    return individual_court, parent_court
+
+
+def prime_booking_venues(db: Session, bookings) -> None:
+    """Fetch the individual courts and courts of many bookings with one IN query each."""
+    loaders = get_loaders(db)
+    individual_courts = loaders.individual_courts.load_many({b.individual_court_id for b in bookings})
+    loaders.courts.prime(ic.court_id for ic in individual_courts if ic is not None)
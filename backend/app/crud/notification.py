@@ -1,6 +1,9 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.notification import Notification, CourtRequest, AdvertisementRequest, AdvertisementClick
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, insert, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.notification_bus import notify_user_changed
+from app.models.notification import Notification, NotificationCounter, CourtRequest, AdvertisementRequest, AdvertisementClick
 from app.schemas.notification import (
     NotificationCreate,
     CourtRequestCreate,
@@ -8,40 +11,111 @@ from app.schemas.notification import (
     AdvertisementRequestCreate,
     AdvertisementRequestUpdate,
 )
-from typing import List, Optional
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 
+# Digests the retention job writes for old notifications; their ids are new but
+# their content is not, so open streams do not push them as new notifications.
+# A user has at most one streak digest; its related_id holds how many warnings
+# it combines, so later runs can merge into it.
+STREAK_WARNING_DIGEST_TYPE = "friend_streak_warning_digest"
+BACKFILLED_NOTIFICATION_TYPES = (STREAK_WARNING_DIGEST_TYPE,)
+
 
 # Notification CRUD
+def _unread_delta_statement(user_id: int, delta: int):
+    """Upsert adding delta to a user's unread counter (never below zero)"""
+    statement = pg_insert(NotificationCounter).values(user_id=user_id, unread_count=max(delta, 0))
+    return statement.on_conflict_do_update(
+        index_elements=[NotificationCounter.user_id],
+        set_={
+            "unread_count": func.greatest(NotificationCounter.unread_count + delta, 0),
+            "updated_at": func.now(),
+        },
+    )
+
+
+def _unread_increments_statement(increments: Dict[int, int]):
+    """
+    One multi-row upsert adding increments[user_id] to each user's unread
+    counter; negative increments decrement an existing counter down to zero
+    """
+    # Sorted so concurrent fan-outs lock counter rows in the same order.
+    statement = pg_insert(NotificationCounter).values(
+        [{"user_id": user_id, "unread_count": count} for user_id, count in sorted(increments.items())]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[NotificationCounter.user_id],
+        set_={
+            "unread_count": func.greatest(NotificationCounter.unread_count + statement.excluded.unread_count, 0),
+            "updated_at": func.now(),
+        },
+    )
+
+
+def create_notifications(db: Session, notifications: Sequence[NotificationCreate]) -> List[Notification]:
+    """
+    Create many notifications in one transaction: one multi-row INSERT for the
+    rows, one upsert for the unread counters and one push per recipient, all
+    committed together.
+    """
+    if not notifications:
+        return []
+
+    rows = [notification.model_dump() for notification in notifications]
+    created = list(db.scalars(insert(Notification).returning(Notification), rows).all())
+
+    increments = Counter(item.user_id for item in created if not item.is_read)
+    if increments:
+        db.execute(_unread_increments_statement(increments))
+    for user_id in {item.user_id for item in created}:
+        notify_user_changed(db, user_id)
+
+    db.commit()
+    return created
+
+
 def create_notification(db: Session, notification: NotificationCreate) -> Notification:
     """Create a new notification"""
-    db_notification = Notification(**notification.model_dump())
-    db.add(db_notification)
-    db.commit()
-    db.refresh(db_notification)
-    return db_notification
+    return create_notifications(db, [notification])[0]
 
 
 def get_user_notifications(db: Session, user_id: int, skip: int = 0, limit: int = 50) -> List[Notification]:
     """Get all notifications for a user"""
-    return db.query(Notification).filter(
-        Notification.user_id == user_id
-    ).order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+    statement = _user_notifications_statement(user_id).offset(skip).limit(limit)
+    return list(db.execute(statement).scalars().all())
 
 
 def get_unread_count(db: Session, user_id: int) -> int:
-    """Get count of unread notifications for a user"""
-    return db.query(Notification).filter(
-        Notification.user_id == user_id,
-        Notification.is_read.is_(False)
-    ).count()
+    """Get count of unread notifications for a user (from the maintained counter)"""
+    count = db.query(NotificationCounter.unread_count).filter(NotificationCounter.user_id == user_id).scalar()
+    return count or 0
+
+
+def _mark_read_statement(notification_id: int):
+    """
+    Flip one unread notification to read, returning its user_id only if this
+    statement did it, so concurrent requests decrement the counter once
+    """
+    return (
+        update(Notification)
+        .where(Notification.id == notification_id, Notification.is_read.is_(False))
+        .values(is_read=True)
+        .returning(Notification.user_id)
+        .execution_options(synchronize_session="evaluate")
+    )
 
 
 def mark_as_read(db: Session, notification_id: int) -> Optional[Notification]:
     """Mark a notification as read"""
     notification = db.query(Notification).filter(Notification.id == notification_id).first()
-    if notification:
-        notification.is_read = True
+    if notification is None:
+        return None
+    user_id = db.execute(_mark_read_statement(notification_id)).scalar_one_or_none()
+    if user_id is not None:
+        db.execute(_unread_delta_statement(user_id, -1))
+        notify_user_changed(db, user_id)
         db.commit()
         db.refresh(notification)
     return notification
@@ -49,13 +123,206 @@ def mark_as_read(db: Session, notification_id: int) -> Optional[Notification]:
 
 def mark_all_as_read(db: Session, user_id: int):
     """Mark all notifications as read for a user"""
-    db.query(Notification).filter(
+    updated = db.query(Notification).filter(
         Notification.user_id == user_id,
         Notification.is_read.is_(False)
     ).update({"is_read": True})
+    if updated:
+        db.execute(_unread_delta_statement(user_id, -updated))
+    notify_user_changed(db, user_id)
     db.commit()
 
 
+def mark_notifications_read(db: Session, user_id: int, notification_type: str, related_id: int) -> int:
+    """
+    Mark a user's unread notifications of one type/related entity as read,
+    keeping the unread counter in step. The caller commits.
+    """
+    updated = db.query(Notification).filter(
+        Notification.user_id == user_id,
+        Notification.type == notification_type,
+        Notification.related_id == related_id,
+        Notification.is_read.is_(False),
+    ).update({"is_read": True}, synchronize_session=False)
+    if updated:
+        db.execute(_unread_delta_statement(user_id, -updated))
+        notify_user_changed(db, user_id)
+    return updated
+
+
+def repair_unread_counters(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recompute unread counters from the notifications table and fix the ones
+    that drifted (or are missing). Returns the number of counters written.
+    """
+    notifications_filter = "WHERE user_id = :user_id" if user_id is not None else ""
+    counters_filter = "AND c.user_id = :user_id" if user_id is not None else ""
+    result = db.execute(
+        text(
+            f"""
+            WITH actual AS (
+                SELECT user_id, COUNT(*) FILTER (WHERE is_read = false) AS unread
+                FROM notifications {notifications_filter}
+                GROUP BY user_id
+                UNION ALL
+                SELECT c.user_id, 0
+                FROM notification_counters c
+                WHERE NOT EXISTS (SELECT 1 FROM notifications n WHERE n.user_id = c.user_id) {counters_filter}
+            )
+            INSERT INTO notification_counters (user_id, unread_count)
+            SELECT user_id, unread FROM actual
+            ON CONFLICT (user_id) DO UPDATE
+                SET unread_count = EXCLUDED.unread_count, updated_at = now()
+                WHERE notification_counters.unread_count <> EXCLUDED.unread_count
+            """
+        ),
+        {"user_id": user_id} if user_id is not None else {},
+    )
+    db.commit()
+    return result.rowcount
+
+
+# Async notification CRUD (AsyncSession)
+def _user_notifications_statement(
+    user_id: int,
+    after: Optional[tuple] = None,
+    notification_type: Optional[str] = None,
+    is_read: Optional[bool] = None,
+):
+    """
+    Newest-first feed of a user, keyset-paged on (created_at, id) so each page
+    is an index range scan of ix_notifications_user_id_created_at_id (or the
+    _type_ variant when filtering by type).
+    """
+    statement = select(Notification).where(Notification.user_id == user_id)
+    if notification_type is not None:
+        statement = statement.where(Notification.type == notification_type)
+    if is_read is not None:
+        statement = statement.where(Notification.is_read.is_(is_read))
+    if after is not None:
+        statement = statement.where(tuple_(Notification.created_at, Notification.id) < tuple_(*after))
+    return statement.order_by(Notification.created_at.desc(), Notification.id.desc())
+
+
+async def get_user_notifications_async(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    after: Optional[tuple] = None,
+    notification_type: Optional[str] = None,
+    is_read: Optional[bool] = None,
+) -> List[Notification]:
+    """Get notifications for a user, newest first; pass after=(created_at, id) to page by keyset"""
+    statement = _user_notifications_statement(user_id, after, notification_type, is_read)
+    if skip:
+        statement = statement.offset(skip)
+    result = await db.execute(statement.limit(limit))
+    return list(result.scalars().all())
+
+
+async def get_unread_count_async(db: AsyncSession, user_id: int) -> int:
+    """Get count of unread notifications for a user (from the maintained counter)"""
+    result = await db.execute(
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+    )
+    return result.scalar() or 0
+
+
+def _notifications_version_columns(user_id: int) -> tuple:
+    """
+    Version of a user's notification list as scalar subqueries: the unread
+    counter and its updated_at (bumped by every insert, read flip and retention
+    change) plus the newest id, each a primary-key or top-1 index lookup.
+    """
+    newest = aliased(Notification)
+    return (
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id).scalar_subquery(),
+        select(NotificationCounter.updated_at).where(NotificationCounter.user_id == user_id).scalar_subquery(),
+        select(newest.id)
+        .where(newest.user_id == user_id)
+        .order_by(newest.created_at.desc(), newest.id.desc())
+        .limit(1)
+        .scalar_subquery(),
+    )
+
+
+async def get_notifications_version_async(db: AsyncSession, user_id: int) -> tuple:
+    """Version of a user's notification list: (unread count, counter updated_at, newest id)"""
+    result = await db.execute(select(*_notifications_version_columns(user_id)))
+    return tuple(result.one())
+
+
+async def get_user_notifications_with_version_async(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 50,
+    after: Optional[tuple] = None,
+    notification_type: Optional[str] = None,
+    is_read: Optional[bool] = None,
+) -> Tuple[List[Notification], tuple]:
+    """
+    get_user_notifications_async plus the list version, read in the same
+    statement so a plain (unconditional) request needs no separate probe.
+    """
+    statement = _user_notifications_statement(user_id, after, notification_type, is_read)
+    if skip:
+        statement = statement.offset(skip)
+    statement = statement.limit(limit).add_columns(*_notifications_version_columns(user_id))
+    rows = (await db.execute(statement)).all()
+    if not rows:
+        return [], await get_notifications_version_async(db, user_id)
+    return [row[0] for row in rows], tuple(rows[0][1:])
+
+
+async def get_notifications_after_async(db: AsyncSession, user_id: int, after_id: int, limit: int = 50) -> List[Notification]:
+    """Notifications of a user newer than after_id, oldest first (backfilled digests excluded)"""
+    result = await db.execute(
+        select(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.id > after_id,
+            Notification.type.not_in(BACKFILLED_NOTIFICATION_TYPES),
+        )
+        .order_by(Notification.id.asc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_notification_async(db: AsyncSession, notification_id: int) -> Optional[Notification]:
+    """Get a notification by ID"""
+    return await db.get(Notification, notification_id)
+
+
+async def mark_as_read_async(db: AsyncSession, notification: Notification) -> Notification:
+    """Mark a loaded notification as read"""
+    result = await db.execute(_mark_read_statement(notification.id))
+    user_id = result.scalar_one_or_none()
+    if user_id is not None:
+        await db.execute(_unread_delta_statement(user_id, -1))
+        notify_user_changed(db.sync_session, user_id)
+        await db.commit()
+    return notification
+
+
+async def mark_all_as_read_async(db: AsyncSession, user_id: int):
+    """Mark all notifications as read for a user"""
+    result = await db.execute(
+        update(Notification)
+        .where(
+            Notification.user_id == user_id,
+            Notification.is_read.is_(False),
+        )
+        .values(is_read=True)
+    )
+    if result.rowcount:
+        await db.execute(_unread_delta_statement(user_id, -result.rowcount))
+    notify_user_changed(db.sync_session, user_id)
+    await db.commit()
+
+
 # Court Request CRUD
 def create_court_request(db: Session, request: CourtRequestCreate, owner_id: int) -> CourtRequest:
     """Create a new court registration request"""
@@ -176,6 +443,33 @@ def get_all_advertisement_requests(
     return requests
 
 
+def get_public_advertisements_version(db: Session) -> tuple:
+    """
+    Cheap version of the approved advertisement list: ads count, newest id and
+    last change (including the enterprise owner's profile), plus click count.
+    """
+    from app.models.user import User
+
+    ads_count, max_id, last_ad_change, last_owner_change = (
+        db.query(
+            func.count(AdvertisementRequest.id),
+            func.max(AdvertisementRequest.id),
+            func.max(func.coalesce(AdvertisementRequest.updated_at, AdvertisementRequest.created_at)),
+            func.max(User.updated_at),
+        )
+        .outerjoin(User, User.id == AdvertisementRequest.enterprise_id)
+        .filter(AdvertisementRequest.status == "approved")
+        .one()
+    )
+    click_count = (
+        db.query(func.count(AdvertisementClick.id))
+        .join(AdvertisementRequest, AdvertisementRequest.id == AdvertisementClick.advertisement_request_id)
+        .filter(AdvertisementRequest.status == "approved")
+        .scalar()
+    )
+    return ads_count, max_id, last_ad_change, last_owner_change, click_count
+
+
 def get_enterprise_advertisement_requests(
     db: Session, enterprise_id: int, status: Optional[str] = None
 ) -> List[AdvertisementRequest]:
@@ -0,0 +1,271 @@
+"""
+Notification retention: expire, archive and compact old notifications.
+
+Each notification type is kept for NOTIFICATION_RETENTION_POLICIES[type] days
+(NOTIFICATION_RETENTION_DAYS for unlisted types, 0 keeps a type forever).
+Expired rows are moved to notifications_archive, or deleted when
+NOTIFICATION_RETENTION_ARCHIVE is off. Streak warnings older than
+NOTIFICATION_DIGEST_AFTER_DAYS are first folded into the user's single digest
+row (created on the first run that finds at least two of them); digests are
+backfilled rows, so open streams do not push them as new.
+
+All passes work in batches of about NOTIFICATION_RETENTION_BATCH_SIZE rows,
+each in its own short transaction, so locks are held on one batch at a time.
+Expiry passes skip rows locked by a live writer (SKIP LOCKED) and pick them up
+on the next run. Unread counters are decremented for every unread row removed,
+and touched for every user whose notifications changed, so list ETags change.
+"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, exists, func, insert, or_, select, update
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.notification_bus import notify_user_changed
+from app.crud.friend import STREAK_WARNING_TYPE
+from app.crud.notification import STREAK_WARNING_DIGEST_TYPE, _unread_increments_statement
+from app.models.notification import Notification, NotificationArchive
+
+# Compaction works per user; a user rarely has more than a handful of old
+# warnings, so batch_size // this many users keeps a batch near batch_size rows.
+WARNINGS_PER_USER_ESTIMATE = 10
+
+_ROW_COLUMNS = (
+    Notification.id,
+    Notification.user_id,
+    Notification.title,
+    Notification.message,
+    Notification.type,
+    Notification.related_id,
+    Notification.is_read,
+    Notification.created_at,
+)
+
+
+def _batch_size(batch_size: Optional[int]) -> int:
+    return max(1, batch_size or settings.NOTIFICATION_RETENTION_BATCH_SIZE)
+
+
+def _batch_ids_statement(conditions: Sequence, batch_size: int):
+    """Oldest batch_size ids matching conditions, skipping rows locked by other transactions"""
+    return (
+        select(Notification.id)
+        .where(*conditions)
+        .order_by(Notification.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def _remove_batch(db: Session, criteria: Sequence, archive: bool) -> List:
+    """Delete (and optionally archive) the rows matching criteria; the caller commits"""
+    rows = db.execute(
+        delete(Notification)
+        .where(*criteria)
+        .returning(*_ROW_COLUMNS)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not rows:
+        return rows
+
+    if archive:
+        db.execute(insert(NotificationArchive), [row._asdict() for row in rows])
+
+    unread = Counter(row.user_id for row in rows if not row.is_read)
+    db.execute(_unread_increments_statement({row.user_id: -unread[row.user_id] for row in rows}))
+    for user_id in unread:
+        notify_user_changed(db, user_id)
+    return rows
+
+
+def _drain(db: Session, conditions: Sequence, archive: bool, batch_size: int) -> int:
+    """Remove every row matching conditions, one committed batch at a time"""
+    ids_statement = _batch_ids_statement(conditions, batch_size)
+    removed = 0
+    while True:
+        rows = _remove_batch(db, [Notification.id.in_(ids_statement)], archive)
+        db.commit()
+        removed += len(rows)
+        if len(rows) < batch_size:
+            return removed
+
+
+def _count(db: Session, conditions: Sequence) -> int:
+    return db.execute(select(func.count(Notification.id)).where(*conditions)).scalar_one()
+
+
+def _expiry_passes(now: datetime) -> List[tuple]:
+    """(label, conditions) per retention policy, the default policy last"""
+    policies = settings.NOTIFICATION_RETENTION_POLICIES
+    passes = [
+        (notification_type, [Notification.type == notification_type, Notification.created_at < now - timedelta(days=days)])
+        for notification_type, days in policies.items()
+        if days > 0
+    ]
+    if settings.NOTIFICATION_RETENTION_DAYS > 0:
+        conditions = [Notification.created_at < now - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)]
+        if policies:
+            conditions.append(Notification.type.not_in(list(policies)))
+        passes.append(("*", conditions))
+    return passes
+
+
+def prune_expired_notifications(
+    db: Session,
+    now: Optional[datetime] = None,
+    archive: Optional[bool] = None,
+    batch_size: Optional[int] = None,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    Archive or delete notifications past their type's retention. Returns rows
+    removed (or, with dry_run, rows that would be) per policy; "*" is the
+    default policy.
+    """
+    now = now or datetime.now(timezone.utc)
+    archive = settings.NOTIFICATION_RETENTION_ARCHIVE if archive is None else archive
+    batch_size = _batch_size(batch_size)
+
+    removed = {}
+    for label, conditions in _expiry_passes(now):
+        if dry_run:
+            removed[label] = _count(db, conditions)
+        else:
+            removed[label] = _drain(db, conditions, archive, batch_size)
+    return removed
+
+
+def _digest_message(count: int, last: datetime) -> str:
+    return f"{count} streak reminders up to {last:%d/%m/%Y} were combined into this summary."
+
+
+def _digest_row(user_id: int, warnings: List) -> dict:
+    last = max(row.created_at for row in warnings)
+    return {
+        "user_id": user_id,
+        "title": "Streak reminders",
+        "message": _digest_message(len(warnings), last),
+        "type": STREAK_WARNING_DIGEST_TYPE,
+        "related_id": len(warnings),
+        "is_read": all(row.is_read for row in warnings),
+        "created_at": last,
+    }
+
+
+def _merge_digests(db: Session, by_user: Dict[int, List]) -> Counter:
+    """
+    Fold each user's removed warnings into their digest, creating it if there
+    is none; extra digests left by older runs are merged in and removed.
+    Returns the unread counter increments.
+    """
+    digests: Dict[int, List] = {}
+    for digest in db.execute(
+        select(*_ROW_COLUMNS)
+        .where(Notification.type == STREAK_WARNING_DIGEST_TYPE, Notification.user_id.in_(list(by_user)))
+        .order_by(Notification.id)
+    ):
+        digests.setdefault(digest.user_id, []).append(digest)
+
+    increments: Counter = Counter()
+    new_rows, updates, extra_ids = [], [], []
+    for user_id, warnings in sorted(by_user.items()):
+        merged = _digest_row(user_id, warnings)
+        existing = digests.get(user_id)
+        if not existing:
+            new_rows.append(merged)
+            increments[user_id] += 0 if merged["is_read"] else 1
+            continue
+
+        *extras, kept = existing
+        extra_ids.extend(digest.id for digest in extras)
+        count = merged["related_id"] + sum(digest.related_id or 1 for digest in existing)
+        last = max([merged["created_at"], *(digest.created_at for digest in existing)])
+        is_read = merged["is_read"] and all(digest.is_read for digest in existing)
+        updates.append(
+            {
+                "id": kept.id,
+                "message": _digest_message(count, last),
+                "related_id": count,
+                "is_read": is_read,
+                "created_at": last,
+            }
+        )
+        was_unread = sum(1 for digest in existing if not digest.is_read)
+        increments[user_id] += (0 if is_read else 1) - was_unread
+
+    if extra_ids:
+        db.execute(delete(Notification).where(Notification.id.in_(extra_ids)).execution_options(synchronize_session=False))
+    if updates:
+        db.execute(update(Notification).execution_options(synchronize_session=False), updates)
+    if new_rows:
+        db.execute(insert(Notification), new_rows)
+    return increments
+
+
+def compact_streak_warnings(
+    db: Session,
+    now: Optional[datetime] = None,
+    archive: Optional[bool] = None,
+    batch_size: Optional[int] = None,
+    dry_run: bool = False,
+) -> int:
+    """
+    Fold streak warnings older than NOTIFICATION_DIGEST_AFTER_DAYS into one
+    digest notification per user (unread if any folded notification was).
+    Users with a single old warning and no digest yet are left alone. Users are
+    handled a batch at a time, each user's warnings all in one batch, so rerunning
+    only merges newly aged warnings. Returns the number of warnings compacted.
+    """
+    now = now or datetime.now(timezone.utc)
+    archive = settings.NOTIFICATION_RETENTION_ARCHIVE if archive is None else archive
+    users_per_batch = max(1, _batch_size(batch_size) // WARNINGS_PER_USER_ESTIMATE)
+    conditions = [
+        Notification.type == STREAK_WARNING_TYPE,
+        Notification.created_at < now - timedelta(days=settings.NOTIFICATION_DIGEST_AFTER_DAYS),
+    ]
+    digest = aliased(Notification)
+    has_digest = exists().where(digest.user_id == Notification.user_id, digest.type == STREAK_WARNING_DIGEST_TYPE)
+    eligible_users = (
+        select(Notification.user_id)
+        .where(*conditions)
+        .group_by(Notification.user_id)
+        .having(or_(func.count(Notification.id) >= 2, has_digest))
+    )
+    if dry_run:
+        return _count(db, [*conditions, Notification.user_id.in_(eligible_users)])
+
+    users_statement = eligible_users.order_by(Notification.user_id).limit(users_per_batch)
+    compacted = 0
+    while True:
+        user_ids = list(db.scalars(users_statement).all())
+        rows = _remove_batch(db, [Notification.user_id.in_(user_ids), *conditions], archive) if user_ids else []
+        if rows:
+            by_user: Dict[int, List] = {}
+            for row in rows:
+                by_user.setdefault(row.user_id, []).append(row)
+            increments = _merge_digests(db, by_user)
+            db.execute(_unread_increments_statement(increments))
+            for user_id in by_user:
+                notify_user_changed(db, user_id)
+        db.commit()
+        compacted += len(rows)
+        if len(user_ids) < users_per_batch:
+            return compacted
+
+
+def delete_notifications_by_type(
+    db: Session,
+    notification_types: Sequence[str],
+    user_id: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    dry_run: bool = False,
+) -> int:
+    """Delete every notification of the given types (optionally for one user) in batches"""
+    conditions = [Notification.type.in_(list(notification_types))]
+    if user_id is not None:
+        conditions.append(Notification.user_id == user_id)
+    if dry_run:
+        return _count(db, conditions)
+    return _drain(db, conditions, archive=False, batch_size=_batch_size(batch_size))
@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app.schemas.user import UserRegister
-from app.core.security import get_password_hash
+from app.core.password_hasher import hash_password_async
+from app.core.principal_cache import invalidate_principal
+from app.core.catalog_cache import invalidate_court_catalog
 from typing import Optional
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -14,9 +16,9 @@ def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     """
     Tìm user theo ID
     """
-    return db.query(User).filter(User.id == user_id).first()
+    return db.get(User, user_id)
 
-def create_user(db: Session, user_data: UserRegister) -> User:
+async def create_user(db: Session, user_data: UserRegister) -> User:
     """
     Tạo user mới
     
@@ -26,9 +28,12 @@ def create_user(db: Session, user_data: UserRegister) -> User:
     
     Returns:
         User object đã tạo
+
+    Raises:
+        PasswordHasherBusy: the password hashing pool is full
     """
-    # Hash password
-    hashed_password = get_password_hash(user_data.password)
+    # Hash password on the bounded hasher pool
+    hashed_password = await hash_password_async(user_data.password)
     
     # Tạo user object
     db_user = User(
@@ -46,17 +51,19 @@ def create_user(db: Session, user_data: UserRegister) -> User:
     
     return db_user
 
-def update_user(db: Session, user_id: int, user_data: dict) -> Optional[User]:
+async def update_user(db: Session, user_id: int, user_data: dict) -> Optional[User]:
     """
     Cập nhật thông tin user
+
+    Raises PasswordHasherBusy when a new password cannot be hashed right now.
     """
     db_user = get_user_by_id(db, user_id)
     if not db_user:
         return None
     
-    # Hash password if it's being updated
+    # Hash password on the bounded hasher pool if it's being updated
     if 'password' in user_data:
-        user_data['hashed_password'] = get_password_hash(user_data['password'])
+        user_data['hashed_password'] = await hash_password_async(user_data['password'])
         del user_data['password']
     
     for key, value in user_data.items():
@@ -65,6 +72,10 @@ def update_user(db: Session, user_id: int, user_data: dict) -> Optional[User]:
     
     db.commit()
     db.refresh(db_user)
+    invalidate_principal(user_id)
+    if db_user.role == 'owner':
+        # Court detail responses embed the owner's name and contact details.
+        invalidate_court_catalog()
     
     return db_user
 
@@ -100,7 +111,8 @@ def delete_user(db: Session, user_id: int) -> bool:
     db.query(Booking).filter(Booking.user_id == user_id).delete()
     
     # If user is owner, delete all their courts (cascade will handle individual_courts and bookings)
-    if db_user.role == 'owner':
+    is_owner = db_user.role == 'owner'
+    if is_owner:
         # Get all courts owned by this user
         courts = db.query(Court).filter(Court.owner_id == user_id).all()
         for court in courts:
@@ -112,6 +124,9 @@ def delete_user(db: Session, user_id: int) -> bool:
     # Delete the user
     db.delete(db_user)
     db.commit()
+    invalidate_principal(user_id)
+    if is_owner:
+        invalidate_court_catalog()
     
     return True
 
@@ -1,21 +1,56 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from app.core.config import settings
-from app.core.database import engine, Base
-from app.api.api import api_router
-from app.api.endpoints import webhooks
-from app.core.storage import ensure_uploads_root
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="Pickleball NP SPORTCLUB API",
-    description="Backend API for Pickleball booking system",
-    version="1.0.0",
-    debug=settings.DEBUG
+from contextlib import asynccontextmanager
+
+from app.core.startup_profile import get_startup_report, print_startup_report, startup_phase
+
+with startup_phase("fastapi"):
+    from fastapi import Depends, FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.staticfiles import StaticFiles
+
+with startup_phase("settings"):
+    from app.core.config import settings
+
+with startup_phase("database"):
+    from app.core.database import get_pool_status
+
+with startup_phase("routers"):
+    from app.api.api import api_router
+    from app.api.endpoints import webhooks
+
+from app.core.notification_bus import (
+    get_notification_bus_mode,
+    notification_bus,
+    start_notification_bus,
+    stop_notification_bus,
 )
+from app.core.password_hasher import get_hasher_status
+from app.core.security import get_current_admin
+from app.core.responses import add_compression_middleware, get_default_response_class
+from app.core.storage import ensure_uploads_root, get_uploads_root
+
+# Schema changes are applied by Alembic migrations (alembic upgrade head), not at startup.
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with startup_phase("uploads directory"):
+        ensure_uploads_root()
+    await start_notification_bus()
+    if settings.STARTUP_PROFILE:
+        print_startup_report()
+    yield
+    await stop_notification_bus()
+
+
+with startup_phase("app setup"):
+    app = FastAPI(
+        title="Pickleball NP SPORTCLUB API",
+        description="Backend API for Pickleball booking system",
+        version="1.0.0",
+        debug=settings.DEBUG,
+        lifespan=lifespan,
+        default_response_class=get_default_response_class(),
+    )
 
 # CORS Middleware
 app.add_middleware(
@@ -27,15 +62,17 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Compression wraps CORS so compressed responses still carry CORS headers
+add_compression_middleware(app)
+
 # Include API router
 app.include_router(api_router, prefix="/api")
 
 # Include webhooks router (no auth required)
 app.include_router(webhooks.router, prefix="/webhooks", tags=["webhooks"])
 
-# Mount static files for uploads
-uploads_dir = ensure_uploads_root()
-app.mount("/uploads", StaticFiles(directory=str(uploads_dir)), name="uploads")
+# Mount static files for uploads; the directory is created in lifespan
+app.mount("/uploads", StaticFiles(directory=str(get_uploads_root()), check_dir=False), name="uploads")
 
 
 @app.get("/")
@@ -49,4 +86,28 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+# Worker internals below are for operators only.
+@app.get("/health/db-pool", dependencies=[Depends(get_current_admin)])
+def db_pool_health():
+    """Connection pool occupancy and checkout wait metrics for this worker."""
+    return get_pool_status()
+
+
+@app.get("/health/password-hasher", dependencies=[Depends(get_current_admin)])
+def password_hasher_health():
+    """Password hashing queue depth and latency for this worker."""
+    return get_hasher_status()
+
+@app.get("/health/notification-streams", dependencies=[Depends(get_current_admin)])
+def notification_streams_health():
+    """Open notification streams in this worker."""
+    return {"backend": get_notification_bus_mode(), "subscribers": notification_bus.subscriber_count()}
+
+
+@app.get("/health/startup", dependencies=[Depends(get_current_admin)])
+def startup_health():
+    """Startup phase timings and imported modules for this worker."""
+    return get_startup_report()
@@ -1,6 +1,6 @@
 from app.models.user import User, UserRole
 from app.models.court import Court, IndividualCourt, Booking, BookingInvite
-from app.models.notification import Notification, CourtRequest, AdvertisementRequest, AdvertisementClick
+from app.models.notification import Notification, NotificationArchive, NotificationCounter, CourtRequest, AdvertisementRequest, AdvertisementClick
 from app.models.friend import FriendRequest, Friendship
 
 __all__ = [
@@ -11,6 +11,8 @@ __all__ = [
 	"Booking",
 	"BookingInvite",
 	"Notification",
+	"NotificationArchive",
+	"NotificationCounter",
 	"CourtRequest",
 	"AdvertisementRequest",
 	"AdvertisementClick",
@@ -1,10 +1,23 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Enum as SQLEnum, Numeric, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Enum as SQLEnum, Numeric, UniqueConstraint, Index
+from sqlalchemy import DDL, event, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint, TSTZRANGE
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.core.database import Base
+from app.core.timeslots import time_to_minutes
 import enum
 
 
+def _minutes_or_none(value):
+    """Parse "HH:MM" into minutes since midnight, None when missing or malformed."""
+    if not value:
+        return None
+    try:
+        return time_to_minutes(value)
+    except ValueError:
+        return None
+
+
 class PaymentMethod(str, enum.Enum):
     """Payment method options"""
     vietqr = "vietqr"  # VietQR bank transfer
@@ -35,7 +48,7 @@ class Court(Base):
     __tablename__ = "courts"
 
     id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     address = Column(String, nullable=False)
     district = Column(String, nullable=False)
@@ -44,6 +57,8 @@ class Court(Base):
     court_quantity = Column(Integer, nullable=False, default=1)  # Number of individual courts
     opening_time = Column(String, nullable=False)  # Format: "HH:MM"
     closing_time = Column(String, nullable=False)  # Format: "HH:MM"
+    opening_minute = Column(Integer, nullable=True)  # Minutes since midnight, synced from opening_time
+    closing_minute = Column(Integer, nullable=True)  # Minutes since midnight, synced from closing_time
     facilities = Column(JSON, nullable=True)  # List of facility IDs
     contact_phone = Column(String, nullable=False)
     contact_email = Column(String, nullable=True)
@@ -57,13 +72,19 @@ class Court(Base):
     owner = relationship("User", back_populates="courts")
     individual_courts = relationship("IndividualCourt", back_populates="court", cascade="all, delete-orphan")
 
+    @validates("opening_time", "closing_time")
+    def _sync_minute_columns(self, key, value):
+        minute_key = "opening_minute" if key == "opening_time" else "closing_minute"
+        setattr(self, minute_key, _minutes_or_none(value))
+        return value
+
 
 class IndividualCourt(Base):
     """Individual court within a venue"""
     __tablename__ = "individual_courts"
 
     id = Column(Integer, primary_key=True, index=True)
-    court_id = Column(Integer, ForeignKey("courts.id"), nullable=False)
+    court_id = Column(Integer, ForeignKey("courts.id"), nullable=False, index=True)
     name = Column(String, nullable=False)  # e.g., "Sân 1", "Sân VIP A"
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -77,13 +98,32 @@ class IndividualCourt(Base):
 class Booking(Base):
     """Booking for an individual court"""
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Availability and overlap checks always filter by court and date.
+        Index("ix_bookings_individual_court_id_booking_date", "individual_court_id", "booking_date"),
+        # Postgres guarantees no two blocking bookings overlap on the same court.
+        # A booking blocks while either status column is live (crud.court._is_blocking_booking).
+        ExcludeConstraint(
+            ("individual_court_id", "="),
+            ("slot_range", "&&"),
+            name="ex_bookings_no_overlap",
+            using="gist",
+            where=text(
+                "status IN ('pending', 'active', 'confirmed') "
+                "OR booking_status IN ('pending', 'active', 'confirmed')"
+            ),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     individual_court_id = Column(Integer, ForeignKey("individual_courts.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     booking_date = Column(DateTime(timezone=True), nullable=False)
     start_time = Column(String, nullable=False)  # Format: "HH:MM"
     end_time = Column(String, nullable=False)  # Format: "HH:MM"
+    start_minute = Column(Integer, nullable=True)  # Minutes since midnight, synced from start_time
+    end_minute = Column(Integer, nullable=True)  # Minutes since midnight, synced from end_time
+    slot_range = Column(TSTZRANGE, nullable=True)  # [start, end) in local time, used by ex_bookings_no_overlap
     phone_number = Column(String, nullable=False)
     customer_name = Column(String, nullable=True)  # Name of person who booked
     
@@ -112,6 +152,20 @@ class Booking(Base):
     individual_court = relationship("IndividualCourt", back_populates="bookings")
     user = relationship("User", back_populates="bookings")
 
+    @validates("start_time", "end_time")
+    def _sync_minute_columns(self, key, value):
+        minute_key = "start_minute" if key == "start_time" else "end_minute"
+        setattr(self, minute_key, _minutes_or_none(value))
+        return value
+
+
+# The exclusion constraint mixes an integer "=" with a range "&&" in one GiST index.
+event.listen(
+    Booking.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist"),
+)
+
 
 class BookingInvite(Base):
     """Single-use invitation code tied to a confirmed/active booking."""
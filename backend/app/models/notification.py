@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -9,6 +9,7 @@ class Notification(Base):
     __tablename__ = "notifications"
 
     id = Column(Integer, primary_key=True, index=True)
+    # Indexed by the composite indexes below (user_id leads each of them)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     message = Column(Text, nullable=False)
@@ -20,13 +21,47 @@ class Notification(Base):
     # Relationships
     user = relationship("User", back_populates="notifications")
 
+    __table_args__ = (
+        Index("ix_notifications_user_id_is_read", "user_id", "is_read"),
+        # Keyset feed: WHERE user_id = ? [AND (created_at, id) < cursor] ORDER BY created_at DESC, id DESC
+        Index("ix_notifications_user_id_created_at_id", user_id, created_at.desc(), id.desc()),
+        Index("ix_notifications_user_id_type_created_at_id", user_id, type, created_at.desc(), id.desc()),
+        # Retention scans: WHERE created_at < cutoff [AND type = ?]
+        Index("ix_notifications_created_at_type", created_at, type),
+    )
+
+
+class NotificationArchive(Base):
+    """Notifications moved out of the hot table by the retention job"""
+    __tablename__ = "notifications_archive"
+
+    # Same id as the original notification
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False, index=True)
+    title = Column(String, nullable=False)
+    message = Column(Text, nullable=False)
+    type = Column(String, nullable=False)
+    related_id = Column(Integer, nullable=True)
+    is_read = Column(Boolean, default=False)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class NotificationCounter(Base):
+    """Per-user unread notification count, maintained by the notification CRUD writers"""
+    __tablename__ = "notification_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 
 class CourtRequest(Base):
     """Court registration request model"""
     __tablename__ = "court_requests"
 
     id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     
     # Court information (same as Court model)
     name = Column(String, nullable=False)
@@ -60,7 +95,7 @@ class AdvertisementRequest(Base):
     __tablename__ = "advertisement_requests"
 
     id = Column(Integer, primary_key=True, index=True)
-    enterprise_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    enterprise_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
 
     name = Column(String, nullable=False)
     description = Column(Text, nullable=False)
@@ -90,7 +125,7 @@ class AdvertisementClick(Base):
         nullable=False,
         index=True,
     )
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     ip_address = Column(String, nullable=True)
     user_agent = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
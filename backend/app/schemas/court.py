@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 
 # Time Slot Schema
 class TimeSlot(BaseModel):
@@ -56,6 +56,7 @@ class Court(CourtBase):
     is_active: bool
     created_at: datetime
     updated_at: Optional[datetime] = None
+    quoted_price: Optional[float] = None  # Price of the searched time range, availability search only
 
     class Config:
         from_attributes = True
@@ -192,6 +193,36 @@ class IndividualCourtWithBookings(IndividualCourt):
     bookings: List[Booking] = []
 
 
+# Per-date slot availability for a venue
+class IndividualCourtSlotAvailability(BaseModel):
+    id: int
+    name: str
+    is_active: bool
+    busy_slots: str  # Hex bitmap, bit i = slot starting at i * slot_minutes
+
+
+class CourtDayAvailability(BaseModel):
+    court_id: int
+    booking_date: date
+    slot_minutes: int
+    slots_per_day: int
+    individual_courts: List[IndividualCourtSlotAvailability] = []
+
+
+class FreeWindow(BaseModel):
+    booking_date: date
+    start_time: str
+    end_time: str
+    price: float
+    free_court_count: int
+
+
+class FreeWindowSearchResponse(BaseModel):
+    court_id: int
+    duration_minutes: int
+    windows: List[FreeWindow] = []
+
+
 # Owner info for court details
 class CourtOwner(BaseModel):
     id: int
@@ -229,6 +260,27 @@ class BookingDetail(Booking):
         from_attributes = True
 
 
+# Lightweight owner schedule row (view=compact)
+class OwnerBookingCompact(BaseModel):
+    id: int
+    booking_date: datetime
+    start_time: str
+    end_time: str
+    individual_court_id: int
+    individual_court_name: str
+    court_id: int
+    court_name: str
+    customer_name: Optional[str] = None
+    phone_number: str
+    status: Optional[str] = None
+    booking_status: Optional[str] = None
+    payment_status: Optional[str] = None
+    total_price: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
 # Summary response for owner bookings
 class OwnerBookingsSummary(BaseModel):
     total_bookings: int
@@ -238,6 +290,34 @@ class OwnerBookingsSummary(BaseModel):
     period_days: int
 
 
+# Owner revenue and occupancy analytics
+class OwnerAnalyticsValues(BaseModel):
+    revenue: float
+    hours_sold: float
+    capacity_hours: float
+    occupancy_rate: float
+    revenue_bookings: int
+    total_bookings: int
+    cancelled_bookings: int
+
+
+class OwnerAnalyticsBucket(OwnerAnalyticsValues):
+    period_start: date
+    court_id: int
+    court_name: str
+    individual_court_id: Optional[int] = None
+    individual_court_name: Optional[str] = None
+
+
+class OwnerAnalytics(BaseModel):
+    start_date: date
+    end_date: date
+    granularity: str
+    group_by: str
+    totals: OwnerAnalyticsValues
+    buckets: List[OwnerAnalyticsBucket] = []
+
+
 class UserBookingHistoryItem(BaseModel):
     id: int
     court_name: str
@@ -0,0 +1,173 @@
+"""
+Measure JSON serialization and compression cost of large API responses.
+
+Builds synthetic payloads shaped like the heaviest endpoints and compares:
+  - default:  FastAPI path (response_model serialize + json.dumps, JSONResponse)
+  - orjson:   same serialized data rendered with orjson (ORJSONResponse)
+  - pydantic: TypeAdapter.dump_json straight to bytes (used by the catalog cache)
+and the size/time of gzip and, when installed, brotli on the result.
+
+No database is needed:  python benchmark_serialization.py [--repeat 50]
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+# Ensure imports work even if the script is run from outside backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from pydantic import TypeAdapter
+
+from app.schemas.court import BookingDetail, CourtWithIndividualCourts, IndividualCourtWithBookings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _booking(booking_id: int, individual_court_id: int, day: datetime) -> dict:
+    hour = 6 + booking_id % 16
+    return {
+        "id": booking_id,
+        "individual_court_id": individual_court_id,
+        "user_id": 1000 + booking_id % 97,
+        "booking_date": day,
+        "start_time": f"{hour:02d}:00",
+        "end_time": f"{hour + 1:02d}:30",
+        "phone_number": "0901234567",
+        "customer_name": f"Khách hàng {booking_id}",
+        "customer_email": f"customer{booking_id}@example.com",
+        "status": "active",
+        "total_hours": 1.5,
+        "total_price": 180000.0,
+        "payment_method": "vietqr",
+        "payment_status": "paid",
+        "booking_status": "active",
+        "qr_code_url": f"https://img.vietqr.io/image/970422-0123456789-compact2.png?amount=180000&addInfo=NP{booking_id}",
+        "bank_transaction_id": f"FT{booking_id:010d}",
+        "payment_verified_at": day,
+        "payment_note": "EMAIL_QUEUED",
+        "created_at": day - timedelta(days=1),
+        "updated_at": day,
+    }
+
+
+def _individual_court(court_id: int, venue_id: int, now: datetime, bookings=None) -> dict:
+    data = {
+        "id": court_id,
+        "court_id": venue_id,
+        "name": f"Sân {court_id}",
+        "is_active": True,
+        "is_available": True,
+        "created_at": now,
+        "updated_at": now,
+    }
+    if bookings is not None:
+        data["bookings"] = bookings
+    return data
+
+
+def build_payloads() -> dict:
+    now = datetime(2026, 1, 1, 8, 0)
+    time_slots = [
+        {"start_time": f"{hour:02d}:00", "end_time": f"{hour + 1:02d}:00", "price": 80000.0 + hour * 5000}
+        for hour in range(5, 23)
+    ]
+    court_detail = {
+        "id": 1,
+        "owner_id": 7,
+        "name": "NP SPORTCLUB Pickleball",
+        "address": "123 Nguyễn Văn Linh",
+        "district": "Quận 7",
+        "city": "Hồ Chí Minh",
+        "description": "Cụm sân pickleball trong nhà, có mái che và đèn chiếu sáng." * 4,
+        "court_quantity": 12,
+        "opening_time": "05:00",
+        "closing_time": "23:00",
+        "facilities": ["Bãi giữ xe", "Phòng thay đồ", "Căn tin", "Cho thuê vợt", "Wifi"],
+        "contact_phone": "0901234567",
+        "contact_email": "owner@example.com",
+        "time_slots": time_slots,
+        "images": [f"https://res.cloudinary.com/demo/image/upload/court_{i}.jpg" for i in range(8)],
+        "is_active": True,
+        "created_at": now,
+        "updated_at": now,
+        "individual_courts": [_individual_court(i, 1, now) for i in range(1, 13)],
+        "owner": {"id": 7, "full_name": "Chủ Sân", "email": "owner@example.com", "phone_number": "0901234567"},
+    }
+    individual_courts = [
+        _individual_court(i, 1, now, [_booking(i * 100 + j, i, now + timedelta(days=j)) for j in range(40)])
+        for i in range(1, 13)
+    ]
+    booking_details = []
+    for booking_id in range(1, 301):
+        data = _booking(booking_id, booking_id % 12 + 1, now + timedelta(days=booking_id % 30))
+        data["individual_court"] = _individual_court(booking_id % 12 + 1, 1, now)
+        data["user"] = {"id": data["user_id"], "full_name": "Nguyễn Văn A", "email": "a@example.com", "phone_number": "0907654321"}
+        data["court_name"] = court_detail["name"]
+        booking_details.append(data)
+
+    return {
+        "GET /courts/{id} (CourtWithIndividualCourts)": (CourtWithIndividualCourts, court_detail),
+        "GET /courts/{id}/individual-courts (x12 with 40 bookings)": (List[IndividualCourtWithBookings], individual_courts),
+        "GET /owner/bookings (300 BookingDetail)": (List[BookingDetail], booking_details),
+    }
+
+
+def _time_ms(func, repeat: int) -> float:
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started_at) / repeat * 1000
+
+
+def run(repeat: int) -> None:
+    for name, (schema, raw) in build_payloads().items():
+        adapter = TypeAdapter(schema)
+        value = adapter.validate_python(raw)
+
+        def default_render() -> bytes:
+            # What FastAPI + JSONResponse do for a response_model.
+            content = adapter.dump_python(value, mode="json")
+            return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+        results = [("default (json.dumps)", default_render)]
+        if orjson is not None:
+            results.append(("orjson", lambda: orjson.dumps(adapter.dump_python(value, mode="json"))))
+        results.append(("pydantic dump_json", lambda: adapter.dump_json(value)))
+
+        body = default_render()
+        print(f"\n{name}: {len(body) / 1024:.1f} KiB uncompressed")
+        for label, render in results:
+            print(f"  {label:<22} {_time_ms(render, repeat):8.3f} ms")
+
+        gzipped = gzip.compress(body, compresslevel=6)
+        gzip_ms = _time_ms(lambda: gzip.compress(body, compresslevel=6), repeat)
+        print(f"  gzip level 6           {gzip_ms:8.3f} ms  {len(gzipped) / 1024:.1f} KiB ({len(gzipped) / len(body):.0%})")
+        if brotli is not None:
+            compressed = brotli.compress(body, quality=4)
+            brotli_ms = _time_ms(lambda: brotli.compress(body, quality=4), repeat)
+            print(f"  brotli quality 4       {brotli_ms:8.3f} ms  {len(compressed) / 1024:.1f} KiB ({len(compressed) / len(body):.0%})")
+
+    if orjson is None:
+        print("\norjson is not installed; install it to benchmark FAST_JSON_RESPONSES")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization and compression")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.repeat)
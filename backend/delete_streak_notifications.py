@@ -8,7 +8,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
 from app.core.database import SessionLocal
-from app.models.notification import Notification
+from app.crud.notification_retention import delete_notifications_by_type
 
 STREAK_NOTIFICATION_TYPES = (
     "friend_request_received",
@@ -22,11 +22,7 @@ def delete_streak_notifications(user_id: int | None = None, dry_run: bool = Fals
     """Delete streak-related notifications. Optionally scope to a specific user."""
     db = SessionLocal()
     try:
-        query = db.query(Notification).filter(Notification.type.in_(STREAK_NOTIFICATION_TYPES))
-        if user_id is not None:
-            query = query.filter(Notification.user_id == user_id)
-
-        total = query.count()
+        total = delete_notifications_by_type(db, STREAK_NOTIFICATION_TYPES, user_id=user_id, dry_run=True)
         if total == 0:
             print("No streak notifications found.")
             return 0
@@ -35,11 +31,11 @@ def delete_streak_notifications(user_id: int | None = None, dry_run: bool = Fals
             print(f"Dry run: {total} notification(s) would be deleted.")
             return total
 
-        query.delete(synchronize_session=False)
-        db.commit()
+        # Deletes in committed batches and keeps unread counters in step.
+        deleted = delete_notifications_by_type(db, STREAK_NOTIFICATION_TYPES, user_id=user_id)
 
-        print(f"Deleted {total} streak notification(s).")
-        return total
+        print(f"Deleted {deleted} streak notification(s).")
+        return deleted
     except Exception as exc:
         db.rollback()
         print(f"Delete failed: {exc}")
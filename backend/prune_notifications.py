@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure imports work even if the script is run from outside backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.core.database import SessionLocal
+from app.crud.notification_retention import compact_streak_warnings, prune_expired_notifications
+
+
+def prune_notifications(
+    dry_run: bool = False,
+    archive: bool | None = None,
+    batch_size: int | None = None,
+    compact: bool = True,
+) -> int:
+    """Compact old streak warnings, then archive/delete notifications past their retention."""
+    db = SessionLocal()
+    try:
+        verb = "would be" if dry_run else "were"
+        total = 0
+        if compact:
+            compacted = compact_streak_warnings(db, archive=archive, batch_size=batch_size, dry_run=dry_run)
+            print(f"{compacted} streak warning(s) {verb} compacted into digests.")
+            total += compacted
+
+        removed = prune_expired_notifications(db, archive=archive, batch_size=batch_size, dry_run=dry_run)
+        for label, count in removed.items():
+            policy = "other types" if label == "*" else label
+            print(f"{count} expired notification(s) {verb} removed ({policy}).")
+            total += count
+        return total
+    except Exception as exc:
+        db.rollback()
+        print(f"Prune failed: {exc}")
+        raise
+    finally:
+        db.close()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Apply notification retention: compact streak warnings and archive/delete expired notifications."
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show how many notifications would be compacted or removed without changing anything",
+    )
+    parser.add_argument(
+        "--no-archive",
+        action="store_true",
+        help="Delete expired notifications instead of moving them to notifications_archive",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Rows per transaction (default: NOTIFICATION_RETENTION_BATCH_SIZE)",
+    )
+    parser.add_argument(
+        "--skip-compaction",
+        action="store_true",
+        help="Do not fold old streak warnings into digests",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    prune_notifications(
+        dry_run=args.dry_run,
+        archive=False if args.no_archive else None,
+        batch_size=args.batch_size,
+        compact=not args.skip_compaction,
+    )
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure imports work even if the script is run from outside backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from app.core.database import SessionLocal
+from app.crud.notification import repair_unread_counters
+
+
+def repair_notification_counters(user_id: int | None = None) -> int:
+    """Recompute unread notification counters and fix drifted ones."""
+    db = SessionLocal()
+    try:
+        repaired = repair_unread_counters(db, user_id)
+        print(f"Repaired {repaired} notification counter(s).")
+        return repaired
+    except Exception as exc:
+        db.rollback()
+        print(f"Repair failed: {exc}")
+        raise
+    finally:
+        db.close()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Recompute per-user unread notification counters from the notifications table."
+    )
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        default=None,
+        help="Only repair the counter of this user ID",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    repair_notification_counters(user_id=args.user_id)
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import notification_retention
+from app.crud.friend import STREAK_WARNING_TYPE
+from app.crud.notification import STREAK_WARNING_DIGEST_TYPE
+from app.models.notification import Notification, NotificationArchive, NotificationCounter
+
+NOW = datetime(2026, 10, 18, 12, 0)
+OLD = NOW - timedelta(days=settings.NOTIFICATION_DIGEST_AFTER_DAYS + 1)
+
+
+def _sqlite_unread_increments(increments):
+    """SQLite stand-in for the Postgres counter upsert (max() instead of greatest())"""
+    statement = sqlite_insert(NotificationCounter).values(
+        [{"user_id": user_id, "unread_count": count} for user_id, count in sorted(increments.items())]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=[NotificationCounter.user_id],
+        set_={
+            "unread_count": func.max(NotificationCounter.unread_count + statement.excluded.unread_count, 0),
+            "updated_at": func.now(),
+        },
+    )
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(notification_retention, "_unread_increments_statement", _sqlite_unread_increments)
+    engine = create_engine("sqlite://")
+    tables = [Notification.__table__, NotificationArchive.__table__, NotificationCounter.__table__]
+    Notification.metadata.create_all(engine, tables=tables)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _warn(db, user_id, created_at, is_read=False, id=None):
+    db.add(
+        Notification(
+            id=id,
+            user_id=user_id,
+            title="Streak",
+            message="Your streak is about to end",
+            type=STREAK_WARNING_TYPE,
+            is_read=is_read,
+            created_at=created_at,
+        )
+    )
+
+
+def _set_counters(db, counts):
+    for user_id, count in counts.items():
+        db.add(NotificationCounter(user_id=user_id, unread_count=count))
+
+
+def _rows(db, user_id, notification_type):
+    return db.scalars(
+        select(Notification).where(Notification.user_id == user_id, Notification.type == notification_type)
+    ).all()
+
+
+def _unread(db, user_id):
+    return db.scalar(select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id))
+
+
+def test_compaction_rerun_merges_into_one_digest_per_user(db):
+    for offset in range(3):
+        _warn(db, 1, OLD - timedelta(days=offset))
+    _warn(db, 2, OLD, is_read=True)
+    _warn(db, 2, OLD - timedelta(days=1), is_read=True)
+    _set_counters(db, {1: 3, 2: 0})
+    db.commit()
+
+    assert notification_retention.compact_streak_warnings(db, now=NOW) == 5
+
+    # A warning that ages in between is merged, not given a second digest.
+    # (Explicit id: SQLite reuses freed rowids, which are already archived.)
+    _warn(db, 1, OLD + timedelta(hours=1), id=100)
+    db.execute(NotificationCounter.__table__.update().where(NotificationCounter.user_id == 1).values(unread_count=2))
+    db.commit()
+    assert notification_retention.compact_streak_warnings(db, now=NOW + timedelta(days=1)) == 1
+    assert notification_retention.compact_streak_warnings(db, now=NOW + timedelta(days=1)) == 0
+
+    [digest] = _rows(db, 1, STREAK_WARNING_DIGEST_TYPE)
+    assert digest.related_id == 4
+    assert digest.message.startswith("4 streak reminders")
+    assert not digest.is_read
+    assert _rows(db, 1, STREAK_WARNING_TYPE) == []
+    assert _unread(db, 1) == 1
+
+    [digest] = _rows(db, 2, STREAK_WARNING_DIGEST_TYPE)
+    assert digest.related_id == 2
+    assert digest.is_read
+    assert _unread(db, 2) == 0
+
+    assert db.scalar(select(func.count()).select_from(NotificationArchive)) == 6
+
+
+def test_compaction_skips_users_with_a_single_warning(db):
+    _warn(db, 1, OLD)
+    _warn(db, 1, NOW)
+    _set_counters(db, {1: 2})
+    db.commit()
+
+    assert notification_retention.compact_streak_warnings(db, now=NOW, dry_run=True) == 0
+    assert notification_retention.compact_streak_warnings(db, now=NOW) == 0
+    assert _rows(db, 1, STREAK_WARNING_DIGEST_TYPE) == []
+    assert len(_rows(db, 1, STREAK_WARNING_TYPE)) == 2
+    assert _unread(db, 1) == 2
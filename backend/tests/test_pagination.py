@@ -0,0 +1,44 @@
+import base64
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        (datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=timezone.utc), 42),
+        (datetime(2026, 1, 1, tzinfo=timezone(timedelta(hours=7))), 1),
+        (datetime(2026, 1, 1, 12, 0), 7),
+        ("pending", 3),
+        (None, 0),
+    ],
+)
+def test_cursor_round_trip(values):
+    cursor = encode_cursor(*values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, len(values)) == list(values)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("?>?>?>", 10**12)
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        "%%%",
+        base64.urlsafe_b64encode(b"{not json").decode(),
+        base64.urlsafe_b64encode(b'{"a": 1}').decode(),
+        encode_cursor(1),
+        encode_cursor(1, 2, 3),
+    ],
+)
+def test_decode_cursor_rejects_malformed_cursors(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
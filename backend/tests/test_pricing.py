@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.pricing import compile_price_table
+from app.core.timeslots import minutes_to_time
+
+TIERS = [
+    {"start_time": "06:00", "end_time": "10:00", "price": 80000},
+    {"start_time": "09:00", "end_time": "17:00", "price": 60000},  # overlaps: the first tier wins
+    {"start_time": "17:00", "end_time": "22:30", "price": 120000},
+]
+
+
+def per_slot_price(start_time: str, end_time: str, time_slots: list) -> float:
+    """The per-interval loop compile_price_table replaced, kept as the reference."""
+    if not time_slots:
+        return 0.0
+    current = datetime.strptime(start_time, "%H:%M")
+    end = datetime.strptime(end_time, "%H:%M")
+    total = 0.0
+    while current < end:
+        for slot in time_slots:
+            slot_start = datetime.strptime(slot["start_time"], "%H:%M")
+            slot_end = datetime.strptime(slot["end_time"], "%H:%M")
+            if slot_start <= current < slot_end:
+                total += slot["price"] * 0.5
+                break
+        current += timedelta(minutes=30)
+    return total
+
+
+WINDOWS = [
+    (start, end)
+    for start in range(0, 24 * 60, 45)
+    for end in range(start + 15, 24 * 60, 75)
+]
+
+
+@pytest.mark.parametrize("time_slots", [TIERS, TIERS[::-1], TIERS[:1], []])
+def test_price_table_matches_per_slot_loop(time_slots):
+    table = compile_price_table(time_slots)
+    for start, end in WINDOWS:
+        expected = per_slot_price(minutes_to_time(start), minutes_to_time(end), time_slots)
+        assert table.price(start, end) == pytest.approx(expected), (start, end)
+
+
+def test_price_table_bills_started_intervals_and_empty_windows():
+    table = compile_price_table(TIERS)
+    assert table.price(6 * 60, 6 * 60 + 1) == 40000
+    assert table.price(10 * 60, 10 * 60) == 0.0
+    assert table.price(11 * 60, 10 * 60) == 0.0
+    assert table.price_many([(17 * 60, 18 * 60), (0, 60)]) == [120000, 0.0]
+
+
+def test_malformed_tiers_cost_nothing():
+    table = compile_price_table([{"start_time": "bad", "end_time": "10:00", "price": 1}, {"price": 5}, *TIERS[2:]])
+    assert table.price(6 * 60, 8 * 60) == 0.0
+    assert table.price(17 * 60, 18 * 60) == 120000
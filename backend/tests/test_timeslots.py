@@ -0,0 +1,58 @@
+import pytest
+
+from app.core.timeslots import (
+    FULL_DAY_MASK,
+    MINUTES_PER_DAY,
+    SLOTS_PER_DAY,
+    mask_to_hex,
+    minutes_to_time,
+    slot_mask,
+    time_to_minutes,
+)
+
+
+@pytest.mark.parametrize(
+    "value, minutes",
+    [("00:00", 0), ("7:05", 425), (" 10:30 ", 630), ("23:59", 1439), ("24:00", MINUTES_PER_DAY), ("9", 540)],
+)
+def test_time_to_minutes(value, minutes):
+    assert time_to_minutes(value) == minutes
+
+
+@pytest.mark.parametrize("value", ["24:30", "25:00", "10:60", "10:-5", "-1:00", "ab", "", "10:xx"])
+def test_time_to_minutes_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        time_to_minutes(value)
+
+
+@pytest.mark.parametrize("minutes", [0, 59, 630, 1439, MINUTES_PER_DAY])
+def test_minutes_to_time_round_trip(minutes):
+    assert time_to_minutes(minutes_to_time(minutes)) == minutes
+
+
+def test_slot_mask_edges():
+    assert slot_mask(0, 30) == 0b1
+    assert slot_mask(30, 60) == 0b10
+    # Partially covered slots are touched too.
+    assert slot_mask(15, 45) == 0b11
+    assert slot_mask(29, 31) == 0b11
+    assert slot_mask(0, MINUTES_PER_DAY) == FULL_DAY_MASK
+    assert slot_mask(MINUTES_PER_DAY - 30, MINUTES_PER_DAY) == 1 << (SLOTS_PER_DAY - 1)
+
+
+def test_slot_mask_empty_and_clamped_ranges():
+    assert slot_mask(60, 60) == 0
+    assert slot_mask(90, 60) == 0
+    assert slot_mask(-30, 30) == 0b1
+    assert slot_mask(MINUTES_PER_DAY - 30, MINUTES_PER_DAY + 60) == 1 << (SLOTS_PER_DAY - 1)
+    assert slot_mask(MINUTES_PER_DAY, MINUTES_PER_DAY + 30) == 0
+
+
+def test_adjacent_ranges_do_not_overlap():
+    assert slot_mask(600, 660) & slot_mask(660, 720) == 0
+    assert slot_mask(600, 661) & slot_mask(660, 720) != 0
+
+
+def test_mask_to_hex_is_fixed_width():
+    assert mask_to_hex(0) == "0" * 12
+    assert mask_to_hex(FULL_DAY_MASK) == "f" * 12
@@ -0,0 +1,87 @@
+import axiosInstance, { apiBaseUrl } from './axios'
+
+interface StreamedNotification {
+  id: number
+}
+
+interface NotificationStreamHandlers<T extends StreamedNotification> {
+  onNotification: (notification: T) => void
+  onUnread: (count: number) => void
+  // Called when the stream cannot be used (unsupported, rejected token); fall back to polling
+  onUnavailable: () => void
+}
+
+// Reopen attempts (each with a fresh ticket) before falling back to polling
+const MAX_REOPEN_ATTEMPTS = 3
+
+const fetchStreamTicket = async (): Promise<string> => {
+  const response = await axiosInstance.post<{ ticket: string }>('/notifications/stream-ticket')
+  return response.data.ticket
+}
+
+/**
+ * Subscribe to /notifications/stream (server-sent events).
+ * The stream is opened with a short-lived ticket rather than the access token,
+ * so the token never appears in URLs. Transient errors reconnect on their own;
+ * once the ticket is refused (e.g. expired) the stream is reopened with a new
+ * ticket, resuming from the last notification id.
+ * Returns a function that closes the stream.
+ */
+export const openNotificationStream = <T extends StreamedNotification>(
+  handlers: NotificationStreamHandlers<T>,
+): (() => void) => {
+  if (typeof EventSource === 'undefined' || !localStorage.getItem('token')) {
+    handlers.onUnavailable()
+    return () => {}
+  }
+
+  let source: EventSource | null = null
+  let closed = false
+  let attempts = 0
+  let lastEventId: string | null = null
+
+  const open = async () => {
+    let ticket: string
+    try {
+      ticket = await fetchStreamTicket()
+    } catch {
+      if (!closed) handlers.onUnavailable()
+      return
+    }
+    if (closed) return
+
+    const params = new URLSearchParams({ ticket })
+    if (lastEventId) params.set('last_event_id', lastEventId)
+    const current = new EventSource(`${apiBaseUrl}/notifications/stream?${params}`)
+    source = current
+
+    current.onopen = () => {
+      attempts = 0
+    }
+    current.addEventListener('notification', (event) => {
+      const message = event as MessageEvent
+      if (message.lastEventId) lastEventId = message.lastEventId
+      handlers.onNotification(JSON.parse(message.data) as T)
+    })
+    current.addEventListener('unread', (event) => {
+      handlers.onUnread(JSON.parse((event as MessageEvent).data).count)
+    })
+    current.onerror = () => {
+      // CLOSED means the server refused the stream (e.g. expired ticket); transient errors reconnect automatically
+      if (current.readyState !== EventSource.CLOSED || closed) return
+      attempts += 1
+      if (attempts > MAX_REOPEN_ATTEMPTS) {
+        handlers.onUnavailable()
+        return
+      }
+      void open()
+    }
+  }
+
+  void open()
+
+  return () => {
+    closed = true
+    source?.close()
+  }
+}